@@ -39,6 +39,7 @@ from .management import (
 from .harmonization import (
     check_droma_sample_names,
     check_droma_drug_names,
+    clear_harmonization_cache,
 )
 
 # SQLite matrix storage and retrieval
@@ -78,6 +79,7 @@ __all__ = [
     # Name harmonization
     "check_droma_sample_names",
     "check_droma_drug_names",
+    "clear_harmonization_cache",
     # SQLite matrix storage and retrieval
     "store_matrices_in_database",
     "retrieve_matrix_from_database",
@@ -16,6 +16,10 @@ from .exceptions import DROMAConnectionError, DROMAError
 # Global connection storage
 _global_connection: Optional[sqlite3.Connection] = None
 
+# Prepared statements kept per connection (sqlite3 defaults to 128); the
+# management functions issue many distinct per-table and per-project queries
+_CACHED_STATEMENTS = 256
+
 logger = logging.getLogger(__name__)
 
 
@@ -65,7 +69,7 @@ class DROMADatabase:
             )
         
         try:
-            self.connection = sqlite3.connect(str(self.db_path))
+            self.connection = sqlite3.connect(str(self.db_path), cached_statements=_CACHED_STATEMENTS)
             self.connection.row_factory = sqlite3.Row  # Enable dict-like access
             self._is_connected = True
             logger.info(f"Connected to DROMA database at {self.db_path}")
@@ -214,7 +218,7 @@ def connect_droma_database(
         )
     
     try:
-        connection = sqlite3.connect(str(db_path))
+        connection = sqlite3.connect(str(db_path), cached_statements=_CACHED_STATEMENTS)
         connection.row_factory = sqlite3.Row
         
         if set_global:
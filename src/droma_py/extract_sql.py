@@ -6,13 +6,25 @@ retrieving them, with efficient indexing and metadata management.
 """
 
 import sqlite3
+import atexit
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from itertools import repeat
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import Optional, Union, List
+from typing import Any, Callable, Dict, Optional, Set, Tuple, Union, List
 import logging
 import re
 
+apsw: Any
+try:
+    import apsw
+except ImportError:  # optional dependency, used for zero-copy BLOB reads
+    apsw = None
+
 from .exceptions import (
     DROMAConnectionError,
     DROMADataError,
@@ -22,6 +34,227 @@ from .exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# Pattern for safe table names, and names that already passed validation
+_VALID_TABLE_RE = re.compile(r"^[a-zA-Z_][a-zA-Z0-9_]*$")
+_validated_table_names: Set[str] = set()
+
+# Cached read-only connections of the current thread, keyed by "<abspath>|ro"
+# (plus "<abspath>|ro-blob" for BLOB layout reads and "<abspath>|apsw" when
+# apsw is installed). SQLite connections must not be used by two threads at
+# once, so every thread keeps its own pool; a thread's connections are closed
+# when it exits. Each entry also keeps the (st_dev, st_ino) of the file it was
+# opened on, so a database that has been deleted or replaced on disk gets a
+# fresh connection.
+_thread_pools = threading.local()
+
+# Settings for read-only connections: page reads are served from a memory
+# map of the file (SQLite caps the map at the file size) instead of being
+# copied into the page cache, and temp feature tables stay in memory
+_READ_PRAGMAS = (
+    "PRAGMA mmap_size=1099511627776",
+    "PRAGMA temp_store=MEMORY",
+)
+
+# Maximum number of tables combined into one UNION ALL row-count query
+# (stays below SQLite's default SQLITE_MAX_COMPOUND_SELECT of 500)
+_MAX_UNION_TABLES = 200
+
+# Feature lists longer than this are looked up through a temp table
+# instead of an IN (...) list
+_MAX_INLINE_FEATURES = 500
+
+# Number of rows fetched per batch when reading matrices
+_FETCH_BATCH_SIZE = 8192
+
+# BLOB layout: suffixes of the side tables holding sample names and
+# quantization parameters, the numpy dtypes of the codes stored in the dtype
+# column, and the code used for each store_matrices_in_database dtype
+_BLOB_COLS_SUFFIX = "_cols"
+_BLOB_QUANT_SUFFIX = "_quant"
+_BLOB_DTYPES: Dict[str, np.dtype] = {"f4": np.dtype("<f4"), "u2": np.dtype("<u2"), "u1": np.dtype("u1")}
+_STORE_DTYPES = {"float32": "f4", "int16": "u2", "int8": "u1"}
+
+# Declared types of the BLOB "values" column. Connections opened with
+# decode_blobs=True return these columns as numpy arrays (BLOB_* names keep
+# BLOB affinity)
+_BLOB_DECLTYPES = {code: f"BLOB_{code.upper()}" for code in _BLOB_DTYPES}
+for _code, _decltype in _BLOB_DECLTYPES.items():
+    sqlite3.register_converter(_decltype, partial(np.frombuffer, dtype=_BLOB_DTYPES[_code]))
+
+# A table uses the BLOB layout if it has feature_id and dtype columns and a
+# "values" column of one of these declared types (plain BLOB for tables
+# written before the typed declarations). Its side tables are only treated
+# as such when they also have the expected columns.
+_BLOB_VALUE_TYPES = frozenset({"BLOB", *_BLOB_DECLTYPES.values()})
+_BLOB_SIDE_COLUMNS = {
+    _BLOB_COLS_SUFFIX: ["sample_id", "ord"],
+    _BLOB_QUANT_SUFFIX: ["ord", "scale", "zero_point"],
+}
+
+
+def _pooled_connection(
+    db_path: Path,
+    mode: str,
+    opener: Callable[[Path], Any]
+) -> Any:
+    """
+    Get a cached connection from the current thread's pool, opening it with
+    opener if needed.
+    
+    Args:
+        db_path: Path to the SQLite database file
+        mode: Pool key suffix identifying the kind of connection
+        opener: Function opening a new connection for the absolute path
+    
+    Returns:
+        Any: Cached connection object
+    """
+    pool = _thread_pool()
+    abs_path = db_path.resolve()
+    key = f"{abs_path}|{mode}"
+    
+    cached = pool.get(key)
+    try:
+        stat = os.stat(abs_path)
+        file_id: Optional[Tuple[int, int]] = (stat.st_dev, stat.st_ino)
+    except OSError:
+        file_id = None
+    
+    if cached is not None:
+        conn, cached_id = cached
+        if file_id is not None and cached_id == file_id:
+            return conn
+        # File was removed or replaced since the connection was opened
+        del pool[key]
+        try:
+            conn.close()
+        except Exception:
+            pass
+    
+    conn = opener(abs_path)
+    
+    if file_id is None:
+        # The file appeared between the stat and the open
+        stat = os.stat(abs_path)
+        file_id = (stat.st_dev, stat.st_ino)
+    
+    pool[key] = (conn, file_id)
+    return conn
+
+
+def _thread_pool() -> Dict[str, Tuple[Any, Tuple[int, int]]]:
+    """Get the connection pool of the current thread, creating it if needed."""
+    pool: Optional[Dict[str, Tuple[Any, Tuple[int, int]]]] = getattr(
+        _thread_pools, "connections", None
+    )
+    if pool is None:
+        pool = _thread_pools.connections = {}
+    return pool
+
+
+def _open_read_only(abs_path: Path, decode_blobs: bool = False) -> sqlite3.Connection:
+    """
+    Open a read-only connection tuned for retrieval.
+    
+    Args:
+        abs_path: Absolute path to the SQLite database file
+        decode_blobs: Whether to convert BLOB layout values to numpy arrays
+                      through their declared type. Not used for other reads,
+                      since declared types would also trigger sqlite3's
+                      default date/timestamp converters.
+    
+    Returns:
+        sqlite3.Connection: New database connection
+    """
+    conn = sqlite3.connect(
+        f"{abs_path.as_uri()}?mode=ro",
+        uri=True,
+        detect_types=sqlite3.PARSE_DECLTYPES if decode_blobs else 0
+    )
+    for pragma in _READ_PRAGMAS:
+        conn.execute(pragma)
+    return conn
+
+
+def _get_conn(db_path: Path, decode_blobs: bool = False) -> sqlite3.Connection:
+    """
+    Get the current thread's cached read-only connection to a matrix
+    database, opening it if needed.
+    
+    Connections are opened through a ``mode=ro`` URI. Writes use a new
+    connection per call (see store_matrices_in_database) and are not cached.
+    
+    Args:
+        db_path: Path to the SQLite database file
+        decode_blobs: Whether the connection should return BLOB layout values
+                      as numpy arrays
+    
+    Returns:
+        sqlite3.Connection: Cached database connection
+    
+    Raises:
+        DROMAConnectionError: If the connection cannot be opened
+    """
+    def _open(abs_path: Path) -> sqlite3.Connection:
+        try:
+            conn = _open_read_only(abs_path, decode_blobs)
+            conn.row_factory = sqlite3.Row
+            return conn
+        except sqlite3.Error as e:
+            raise DROMAConnectionError(
+                f"Failed to connect to database: {db_path}",
+                str(e)
+            )
+    
+    conn: sqlite3.Connection = _pooled_connection(
+        db_path, "ro-blob" if decode_blobs else "ro", _open
+    )
+    return conn
+
+
+def _get_apsw_conn(db_path: Path) -> Any:
+    """
+    Get the current thread's cached read-only apsw connection to a matrix
+    database.
+    
+    Args:
+        db_path: Path to the SQLite database file
+    
+    Returns:
+        apsw.Connection: Cached database connection
+    
+    Raises:
+        DROMAConnectionError: If the connection cannot be opened
+    """
+    def _open(abs_path: Path) -> Any:
+        try:
+            conn = apsw.Connection(str(abs_path), flags=apsw.SQLITE_OPEN_READONLY)
+            cursor = conn.cursor()
+            for pragma in _READ_PRAGMAS:
+                cursor.execute(pragma)
+            return conn
+        except apsw.Error as e:
+            raise DROMAConnectionError(
+                f"Failed to connect to database: {db_path}",
+                str(e)
+            )
+    
+    return _pooled_connection(db_path, "apsw", _open)
+
+
+def _close_all() -> None:
+    """Close the cached matrix database connections of the current thread."""
+    pool = _thread_pool()
+    for conn, _ in pool.values():
+        try:
+            conn.close()
+        except Exception:
+            pass
+    pool.clear()
+
+
+atexit.register(_close_all)
+
 
 def _validate_table_name(table_name: str) -> None:
     """
@@ -38,38 +271,187 @@ def _validate_table_name(table_name: str) -> None:
             "table_name must be a non-empty string"
         )
     
+    if table_name in _validated_table_names:
+        return
+    
     # SQLite table names must start with letter/underscore and contain only
-    # letters, numbers, and underscores
-    if re.match(r"^[0-9]|[^a-zA-Z0-9_]", table_name):
+    # letters, numbers, and underscores (isidentifier() alone would also
+    # accept non-ASCII letters)
+    if not (table_name.isascii() and table_name.isidentifier()):
         raise DROMAValidationError(
             f"Invalid table name '{table_name}'",
             "Table names must start with letter/underscore and contain only letters, numbers, underscores"
         )
+    
+    _validated_table_names.add(table_name)
+
+
+def _record_matrix_metadata(
+    conn: sqlite3.Connection,
+    table_name: str,
+    n_features: int,
+    n_samples: int
+) -> None:
+    """
+    Record the dimensions of a stored matrix for list_matrix_tables.
+    
+    Args:
+        conn: Read-write database connection
+        table_name: Name of the matrix table
+        n_features: Number of rows stored
+        n_samples: Number of samples stored
+    """
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS matrix_metadata("
+        "table_name TEXT PRIMARY KEY, n_features INTEGER, n_samples INTEGER, created_at TEXT)"
+    )
+    conn.execute(
+        "INSERT OR REPLACE INTO matrix_metadata VALUES (?, ?, ?, datetime('now'))",
+        (table_name, n_features, n_samples)
+    )
+
+
+def _table_columns(conn: sqlite3.Connection, table_name: str) -> List[Tuple[str, str]]:
+    """
+    Get the (name, upper-cased declared type) of each column of a table.
+    
+    Args:
+        conn: Database connection
+        table_name: Name of the (validated) table
+    
+    Returns:
+        List[Tuple[str, str]]: Columns in table order; empty if the table doesn't exist
+    """
+    rows = conn.execute(f"PRAGMA table_info({table_name})").fetchall()
+    return [(row[1], (row[2] or "").upper()) for row in rows]
+
+
+def _is_blob_layout(column_info: List[Tuple[str, str]]) -> bool:
+    """
+    Check from its columns whether a table uses the BLOB layout.
+    
+    Args:
+        column_info: (name, upper-cased declared type) of each table column
+    
+    Returns:
+        bool: True if the table was written with layout="blob"
+    """
+    column_types = dict(column_info)
+    return bool(
+        column_types.get("values") in _BLOB_VALUE_TYPES
+        and "feature_id" in column_types
+        and "dtype" in column_types
+    )
+
+
+def _blob_side_tables(
+    table_name: str,
+    table_columns: Dict[str, List[Tuple[str, str]]]
+) -> List[str]:
+    """
+    Get the existing side tables that belong to a BLOB layout table.
+    
+    Args:
+        table_name: Name of the matrix table
+        table_columns: Columns of the tables in the database, by table name
+    
+    Returns:
+        List[str]: Names of the side tables; empty if table_name is not a
+        BLOB layout table
+    """
+    if not _is_blob_layout(table_columns.get(table_name, [])):
+        return []
+    
+    side_tables = []
+    for suffix, side_columns in _BLOB_SIDE_COLUMNS.items():
+        columns = table_columns.get(f"{table_name}{suffix}")
+        if columns is not None and [name for name, _ in columns] == side_columns:
+            side_tables.append(f"{table_name}{suffix}")
+    return side_tables
+
+
+def _quote_identifier(name: Any) -> str:
+    """Quote a column name for use in SQL."""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _sql_type(dtype: Any) -> str:
+    """Map a pandas dtype to the SQLite column type pandas.to_sql would use."""
+    if pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_integer_dtype(dtype):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(dtype):
+        return "REAL"
+    if pd.api.types.is_datetime64_any_dtype(dtype):
+        return "TIMESTAMP"
+    return "TEXT"
+
+
+def _has_default_columns(columns: pd.Index) -> bool:
+    """
+    Check whether column labels are pandas defaults rather than sample names.
+    
+    Default labels are the positions 0..n-1 (as produced for numpy input) or
+    "Unnamed: ..." headers (as produced by read_csv).
+    
+    Args:
+        columns: Column index to inspect
+    
+    Returns:
+        bool: True if no column carries a real name
+    """
+    # The usual case for numpy input, answered without touching the labels
+    if isinstance(columns, pd.RangeIndex):
+        return bool(columns.start == 0 and columns.step == 1)
+    
+    if columns.dtype.kind in "iu":
+        return bool((columns.to_numpy() == np.arange(len(columns))).all())
+    
+    return bool(columns.astype(str).str.startswith("Unnamed:").all())
 
 
 def store_matrices_in_database(
     db_path: Union[str, Path],
     matrix: Union[pd.DataFrame, np.ndarray],
-    table_name: str
+    table_name: str,
+    layout: str = "columns",
+    dtype: str = "float32"
 ) -> Path:
     """
     Store a matrix or DataFrame in a SQLite database with efficient indexing.
     
     Converts and stores a matrix or DataFrame in a SQLite database. Row names
     are preserved as feature_id column. The function creates the database
-    directory if needed and creates an index on feature_id for efficient queries.
+    directory if needed. With the default "columns" layout feature_id is the
+    table's primary key, which serves feature lookups without a separate
+    index; feature IDs must therefore be unique. feature_id keeps the SQL type
+    of the row names (e.g. integer row names are stored as integers), and rows
+    are stored in their original order.
     
     Args:
         db_path: Path where the SQLite database file should be created or updated
         matrix: Matrix (numpy array) or DataFrame to store. Must have row and column names.
         table_name: Name of the table to create in database. Must start with letter/underscore
                    and contain only letters, numbers, underscores.
+        layout: Storage layout. "columns" (default) stores one column per sample.
+                "blob" stores each row as a single float32 BLOB, with sample names
+                kept in a "<table_name>_cols" side table; this is much more compact
+                for wide numeric matrices.
+        dtype: Value type for the "blob" layout: "float32" (default), "int16" or
+               "int8". The integer types are lossy: each sample column is scaled
+               linearly onto 65535 / 255 levels between its minimum and maximum,
+               so retrieved values (float64) are off by at most half a step
+               ((max - min) / 65534 or (max - min) / 254). NaN is preserved;
+               infinite values are not supported. Scale and offset per column are
+               kept in a "<table_name>_quant" side table.
     
     Returns:
         Path: Path to the database file
     
     Raises:
-        DROMAValidationError: If inputs are invalid or table name is invalid
+        DROMAValidationError: If inputs are invalid, table name is invalid,
+                              feature IDs are not unique, or the table name
+                              clashes with the side tables of a BLOB layout
+                              matrix
         DROMADataError: If matrix processing fails
         DROMAConnectionError: If database connection fails
     
@@ -94,6 +476,14 @@ def store_matrices_in_database(
         ...                   index=[f"Gene_{i}" for i in range(100)],
         ...                   columns=[f"Sample_{i}" for i in range(10)])
         >>> store_matrices_in_database("data.sqlite", df, "methylation")
+        >>> 
+        >>> # Store a wide numeric matrix as one BLOB per feature
+        >>> store_matrices_in_database("data.sqlite", df, "methylation", layout="blob")
+        >>> 
+        >>> # Beta values in [0, 1] quantized to one byte per value
+        >>> store_matrices_in_database(
+        ...     "data.sqlite", df, "methylation", layout="blob", dtype="int8"
+        ... )
     """
     # First principles validation: check fundamental requirements
     if not isinstance(db_path, (str, Path)):
@@ -118,13 +508,31 @@ def store_matrices_in_database(
     # Validate table name
     _validate_table_name(table_name)
     
+    if layout not in ("columns", "blob"):
+        raise DROMAValidationError(
+            f"Invalid layout '{layout}'",
+            "layout must be 'columns' or 'blob'"
+        )
+    
+    if dtype not in _STORE_DTYPES:
+        raise DROMAValidationError(
+            f"Invalid dtype '{dtype}'",
+            f"dtype must be one of: {', '.join(_STORE_DTYPES)}"
+        )
+    
+    if dtype != "float32" and layout != "blob":
+        raise DROMAValidationError(
+            f"dtype '{dtype}' requires layout='blob'"
+        )
+    
     # Create database directory if needed
     db_dir = db_path.parent
     if not db_dir.exists():
         db_dir.mkdir(parents=True, exist_ok=True)
         logger.info(f"Created directory: {db_dir}")
     
-    # Connect to database with proper cleanup
+    # Connect to database with proper cleanup; the read-write connection
+    # is not cached, so the file is not held open between calls
     logger.info(f"Connecting to database: {db_path}")
     try:
         conn = sqlite3.connect(str(db_path))
@@ -139,67 +547,140 @@ def store_matrices_in_database(
         # Process matrix
         logger.info(f"Processing matrix: {table_name}")
         
-        # Convert to DataFrame if numpy array
+        # Work on the row/column labels and the column arrays directly; the
+        # caller's matrix is never copied or modified
         if isinstance(matrix, np.ndarray):
-            df = pd.DataFrame(matrix)
+            values = matrix[:, np.newaxis] if matrix.ndim == 1 else matrix
+            index = pd.RangeIndex(values.shape[0])
+            columns = pd.RangeIndex(values.shape[1])
+            column_values = [values[:, i] for i in range(values.shape[1])]
         else:
-            df = matrix.copy()
+            index = matrix.index
+            columns = matrix.columns
+            column_values = [matrix.iloc[:, i].to_numpy() for i in range(matrix.shape[1])]
         
         # Validate and generate row names if missing
-        if df.index.name is None:
+        feature_ids = index.to_numpy()
+        if index.name is None:
             # Check if index is generic integer sequence
-            if (isinstance(df.index, pd.RangeIndex) or 
-                (isinstance(df.index, pd.Index) and 
-                 df.index.dtype == 'int64' and 
-                 len(df.index) > 0 and
-                 df.index[0] == 0 and 
-                 df.index[-1] == len(df.index) - 1)):
-                df.index = [f"feature_{i}" for i in range(len(df))]
+            if (isinstance(index, pd.RangeIndex) or 
+                (isinstance(index, pd.Index) and 
+                 index.dtype == 'int64' and 
+                 len(index) > 0 and
+                 index[0] == 0 and 
+                 index[-1] == len(index) - 1)):
+                feature_ids = [f"feature_{i}" for i in range(len(index))]
                 logger.warning("Matrix has no row names. Generated generic names.")
         
         # Validate and generate column names if missing
-        if len(df.columns) > 0:
-            # Check if columns are unnamed (pandas default)
-            if all(str(col).startswith("Unnamed:") or 
-                   (isinstance(col, int) and col == i) 
-                   for i, col in enumerate(df.columns)):
-                df.columns = [f"sample_{i}" for i in range(len(df.columns))]
-                logger.warning("Matrix has no column names. Generated generic names.")
-        
-        # Reset index to create feature_id column
-        # This preserves the index values as a column
-        df = df.reset_index()
-        
-        # Rename the index column to feature_id
-        # After reset_index(), the old index becomes the first column
-        if df.columns[0] != "feature_id":
-            df.rename(columns={df.columns[0]: "feature_id"}, inplace=True)
+        if len(columns) > 0 and _has_default_columns(columns):
+            columns = [f"sample_{i}" for i in range(len(columns))]
+            logger.warning("Matrix has no column names. Generated generic names.")
         
-        # Ensure feature_id is first column (should already be, but double-check)
-        if "feature_id" not in df.columns:
-            raise DROMADataError(
-                "Failed to create feature_id column",
-                "Index reset operation failed"
+        # Build the stored frame with feature_id as first column
+        data = {"feature_id": feature_ids}
+        data.update(zip(columns, column_values))
+        if len(data) != len(columns) + 1:
+            raise DROMAValidationError(
+                "Column names must be unique and must not be 'feature_id'"
             )
-        
-        cols = ["feature_id"] + [col for col in df.columns if col != "feature_id"]
-        df = df[cols]
+        df = pd.DataFrame(data, copy=False)
         
         # Store dimensions for logging
         n_features = len(df)
         n_samples = len(df.columns) - 1  # Subtract 1 for feature_id column
         
-        # Write to database (overwrite if exists)
-        df.to_sql(table_name, conn, if_exists="replace", index=False)
+        # Both layouts key the table on feature_id
+        if not df["feature_id"].is_unique:
+            duplicated = df["feature_id"][df["feature_id"].duplicated()].unique()
+            raise DROMAValidationError(
+                "Feature IDs must be unique",
+                f"Duplicated: {duplicated[:5].tolist()}"
+            )
         
-        # Create index on feature_id for efficient queries
-        index_name = f"idx_{table_name}_feature_id"
-        index_sql = f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} (feature_id)"
-        conn.execute(index_sql)
-        conn.commit()
+        # Side tables are only dropped when they belong to a previous BLOB
+        # layout table of this name; tables of other matrices are never
+        # dropped or overwritten to make room for them
+        parents = [
+            table_name[:-len(suffix)] for suffix in _BLOB_SIDE_COLUMNS
+            if table_name.endswith(suffix) and len(table_name) > len(suffix)
+        ]
+        related_tables = [table_name, *parents] + [
+            f"{table_name}{suffix}" for suffix in _BLOB_SIDE_COLUMNS
+        ]
+        table_columns = {name: _table_columns(conn, name) for name in related_tables}
         
-        logger.info(f"Stored {n_features} features × {n_samples} samples with feature_id index")
+        for parent in parents:
+            if table_name in _blob_side_tables(parent, table_columns):
+                raise DROMAValidationError(
+                    f"Table '{table_name}' holds data of the BLOB layout matrix '{parent}'",
+                    "Store the matrix under another name"
+                )
+        
+        old_side_tables = _blob_side_tables(table_name, table_columns)
+        if layout == "blob":
+            for suffix in _BLOB_SIDE_COLUMNS:
+                side_table = f"{table_name}{suffix}"
+                if table_columns[side_table] and side_table not in old_side_tables:
+                    raise DROMAValidationError(
+                        f"Table '{side_table}' already exists",
+                        "The BLOB layout keeps sample names and quantization parameters in "
+                        f"'{table_name}{_BLOB_COLS_SUFFIX}' and '{table_name}{_BLOB_QUANT_SUFFIX}'; "
+                        "store the matrix under another name"
+                    )
+        for side_table in old_side_tables:
+            conn.execute(f"DROP TABLE {side_table}")
+        
+        if layout == "blob":
+            _write_blob_matrix(
+                conn,
+                table_name,
+                df["feature_id"].tolist(),
+                [str(col) for col in df.columns[1:]],
+                df.iloc[:, 1:].to_numpy(dtype=np.float64),
+                _STORE_DTYPES[dtype]
+            )
+            _record_matrix_metadata(conn, table_name, n_features, n_samples)
+            # Refresh planner statistics for feature_id lookups
+            conn.execute(f"ANALYZE {table_name}")
+            conn.execute("PRAGMA optimize")
+            conn.commit()
+            
+            logger.info(
+                f"Stored {n_features} features × {n_samples} samples as {dtype} BLOB rows"
+            )
+        else:
+            # Write to database (overwrite if exists). The feature_id primary
+            # key index serves feature lookups, so no extra index is needed, and
+            # the rowid keeps the original row order. feature_id keeps the type
+            # of the row names; integers are declared INT rather than INTEGER,
+            # which would make feature_id an alias of the rowid and order the
+            # rows by it
+            conn.execute(f"DROP TABLE IF EXISTS {table_name}")
+            feature_type = _sql_type(df.dtypes.iloc[0])
+            column_defs = ", ".join(
+                [f'"feature_id" {"INT" if feature_type == "INTEGER" else feature_type}']
+                + [
+                    f"{_quote_identifier(col)} {_sql_type(col_dtype)}"
+                    for col, col_dtype in zip(df.columns[1:], df.dtypes.iloc[1:])
+                ]
+            )
+            conn.execute(
+                f'CREATE TABLE {table_name} ({column_defs}, PRIMARY KEY ("feature_id"))'
+            )
+            df.to_sql(table_name, conn, if_exists="append", index=False)
+            _record_matrix_metadata(conn, table_name, n_features, n_samples)
+            # Refresh planner statistics for feature_id lookups
+            conn.execute(f"ANALYZE {table_name}")
+            conn.execute("PRAGMA optimize")
+            conn.commit()
+            
+            logger.info(f"Stored {n_features} features × {n_samples} samples keyed on feature_id")
         
+    except DROMAValidationError:
+        conn.rollback()
+        raise
+    
     except Exception as e:
         conn.rollback()
         raise DROMADataError(
@@ -215,10 +696,465 @@ def store_matrices_in_database(
     return db_path
 
 
+def _write_blob_matrix(
+    conn: sqlite3.Connection,
+    table_name: str,
+    feature_ids: List[str],
+    sample_ids: List[str],
+    values: np.ndarray,
+    dtype_code: str
+) -> None:
+    """
+    Write a matrix using the BLOB layout, replacing any existing table.
+    
+    Each feature is stored as one row holding its values as a little-endian
+    BLOB of the given dtype code. Sample names and their order go to a side
+    table, and so do the scale and offset of quantized (integer) codes.
+    
+    Args:
+        conn: Read-write database connection
+        table_name: Name of the matrix table
+        feature_ids: Row names, one per row of values
+        sample_ids: Column names, one per column of values
+        values: 2-D array of matrix values
+        dtype_code: Key of _BLOB_DTYPES to store values as
+    """
+    cols_table = f"{table_name}{_BLOB_COLS_SUFFIX}"
+    n_samples = len(sample_ids)
+    
+    if dtype_code == "f4":
+        values = values.astype(_BLOB_DTYPES["f4"])
+    else:
+        values, scale, zero_point = _quantize(values, _BLOB_DTYPES[dtype_code])
+        quant_table = f"{table_name}{_BLOB_QUANT_SUFFIX}"
+        conn.execute(
+            f"CREATE TABLE {quant_table} (ord INTEGER, scale REAL, zero_point REAL)"
+        )
+        conn.executemany(
+            f"INSERT INTO {quant_table} VALUES (?, ?, ?)",
+            zip(range(n_samples), scale.tolist(), zero_point.tolist())
+        )
+    
+    conn.execute(f"DROP TABLE IF EXISTS {table_name}")
+    conn.execute(
+        f"CREATE TABLE {table_name} ("
+        f'feature_id TEXT PRIMARY KEY, n_samples INTEGER, dtype TEXT, '
+        f'"values" {_BLOB_DECLTYPES[dtype_code]})'
+    )
+    conn.execute(f"CREATE TABLE {cols_table} (sample_id TEXT, ord INTEGER)")
+    
+    conn.executemany(
+        f"INSERT INTO {table_name} VALUES (?, ?, ?, ?)",
+        (
+            (fid, n_samples, dtype_code, values[i].tobytes())
+            for i, fid in enumerate(feature_ids)
+        )
+    )
+    conn.executemany(
+        f"INSERT INTO {cols_table} VALUES (?, ?)",
+        ((sample_id, i) for i, sample_id in enumerate(sample_ids))
+    )
+
+
+def _quantize(
+    values: np.ndarray,
+    code_dtype: np.dtype
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Quantize matrix values per column onto an unsigned integer dtype.
+    
+    The largest code is reserved for NaN; the remaining codes cover each
+    column's range linearly, so that value = code * scale + zero_point.
+    
+    Args:
+        values: 2-D float64 array of matrix values
+        code_dtype: Unsigned integer dtype of the codes
+    
+    Returns:
+        Tuple[np.ndarray, np.ndarray, np.ndarray]: Codes, per-column scale and
+        per-column zero point
+    
+    Raises:
+        DROMAValidationError: If values contain infinite numbers
+    """
+    if np.isinf(values).any():
+        raise DROMAValidationError(
+            "Quantized storage does not support infinite values"
+        )
+    
+    nan_code = np.iinfo(code_dtype).max
+    is_nan = np.isnan(values)
+    
+    # Column ranges ignoring NaN; all-NaN columns get an empty range at 0
+    zero_point = np.where(is_nan, np.inf, values).min(axis=0)
+    col_max = np.where(is_nan, -np.inf, values).max(axis=0)
+    all_nan = ~np.isfinite(zero_point)
+    zero_point[all_nan] = 0.0
+    col_max[all_nan] = 0.0
+    
+    scale = (col_max - zero_point) / (nan_code - 1)
+    scale[scale == 0] = 1.0
+    
+    codes = np.clip(np.rint((values - zero_point) / scale), 0, nan_code - 1)
+    codes[is_nan] = nan_code
+    return codes.astype(code_dtype), scale, zero_point
+
+
+def _read_blob_matrix(
+    conn: sqlite3.Connection,
+    db_path: Path,
+    table_name: str,
+    from_clause: str,
+    params: Optional[List[str]]
+) -> pd.DataFrame:
+    """
+    Read a matrix stored with the BLOB layout.
+    
+    With apsw installed, BLOBs are read straight into a preallocated array
+    through incremental BLOB I/O; otherwise rows are fetched with sqlite3.
+    
+    Args:
+        conn: Database connection
+        db_path: Path to the SQLite database file
+        table_name: Name of the matrix table
+        from_clause: FROM/WHERE/ORDER BY part of the query, with the matrix
+                     table aliased as t
+        params: Query parameters, or None
+    
+    Returns:
+        pd.DataFrame: Matrix with feature_id values as index
+    """
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    
+    cursor.execute(
+        f"SELECT sample_id FROM {table_name}{_BLOB_COLS_SUFFIX} ORDER BY ord"
+    )
+    sample_cols = [row[0] for row in cursor.fetchall()]
+    
+    values = None
+    if apsw is not None:
+        cursor.execute(f"SELECT t.rowid, t.feature_id, t.dtype {from_clause}", params or [])
+        rows = cursor.fetchall()
+        if not rows:
+            return pd.DataFrame(columns=sample_cols)
+        dtype_code = rows[0][2]
+        feature_ids = [row[1] for row in rows]
+        try:
+            values = _read_blob_rows_apsw(
+                db_path,
+                table_name,
+                [row[0] for row in rows],
+                _BLOB_DTYPES[dtype_code],
+                len(sample_cols)
+            )
+        except apsw.Error as e:
+            logger.debug(f"apsw BLOB read failed, falling back to sqlite3: {e}")
+    
+    if values is None:
+        cursor.execute(f'SELECT t.feature_id, t.dtype, t."values" {from_clause}', params or [])
+        rows = cursor.fetchall()
+        if not rows:
+            return pd.DataFrame(columns=sample_cols)
+        dtype_code = rows[0][1]
+        feature_ids = [row[0] for row in rows]
+        # Tables written before the typed "values" column come back as bytes
+        code_dtype = _BLOB_DTYPES[dtype_code]
+        values = np.stack([
+            blob if isinstance(blob, np.ndarray) else np.frombuffer(blob, dtype=code_dtype)
+            for _, _, blob in rows
+        ])
+    
+    if dtype_code != "f4":
+        # Dequantize integer codes with the per-column scale and offset, in
+        # float64: float32 could not hold values with large offsets to within
+        # half a quantization step
+        cursor.execute(
+            f"SELECT scale, zero_point FROM {table_name}{_BLOB_QUANT_SUFFIX} ORDER BY ord"
+        )
+        scale, zero_point = np.array(cursor.fetchall(), dtype=np.float64).reshape(-1, 2).T
+        is_nan = values == np.iinfo(values.dtype).max
+        values = values.astype(np.float64) * scale + zero_point
+        values[is_nan] = np.nan
+    return pd.DataFrame(
+        values,
+        index=pd.Index(feature_ids, name="feature_id"),
+        columns=sample_cols,
+        copy=False
+    )
+
+
+def _read_blob_rows_apsw(
+    db_path: Path,
+    table_name: str,
+    rowids: List[int],
+    code_dtype: np.dtype,
+    n_samples: int
+) -> np.ndarray:
+    """
+    Read BLOB rows into a preallocated array with apsw incremental BLOB I/O.
+    
+    Args:
+        db_path: Path to the SQLite database file
+        table_name: Name of the matrix table
+        rowids: Row IDs to read, in output order
+        code_dtype: numpy dtype of the stored values
+        n_samples: Number of values per row
+    
+    Returns:
+        np.ndarray: 2-D array with one row per rowid
+    
+    Raises:
+        apsw.Error: If a BLOB cannot be read
+    """
+    values = np.empty((len(rowids), n_samples), dtype=code_dtype)
+    row_bytes = n_samples * code_dtype.itemsize
+    
+    blob = _get_apsw_conn(db_path).blob_open("main", table_name, "values", rowids[0], False)
+    try:
+        for i, rowid in enumerate(rowids):
+            if i:
+                blob.reopen(rowid)
+            if blob.length() != row_bytes:
+                raise apsw.MismatchError(f"Unexpected BLOB size for rowid {rowid}")
+            blob.read_into(values[i])
+    finally:
+        blob.close()
+    return values
+
+
+def _load_feature_table(conn: sqlite3.Connection, features: List[str]) -> str:
+    """
+    Load feature IDs into a temporary lookup table.
+    
+    Temp tables are private to their connection, and cached connections are
+    never shared between threads, so a fixed table name is safe.
+    
+    Args:
+        conn: Database connection
+        features: Feature IDs to load
+    
+    Returns:
+        str: Qualified name of the temporary table
+    """
+    feature_table = "temp._droma_features"
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {feature_table} (feature_id TEXT PRIMARY KEY)"
+    )
+    conn.execute(f"DELETE FROM {feature_table}")
+    conn.executemany(
+        f"INSERT OR IGNORE INTO {feature_table} VALUES (?)",
+        [(f,) for f in features]
+    )
+    # End the implicit transaction so no lock is held on the main database
+    conn.commit()
+    return feature_table
+
+
+def _read_real_matrix(
+    conn: sqlite3.Connection,
+    query: str,
+    params: Optional[List[str]],
+    column_names: List[str]
+) -> pd.DataFrame:
+    """
+    Read a matrix with REAL sample columns into a float64 DataFrame.
+    
+    Rows are fetched in batches and copied into a preallocated numpy array,
+    avoiding the intermediate per-column objects pd.read_sql_query creates.
+    
+    Args:
+        conn: Database connection
+        query: SELECT * query for the matrix table
+        params: Query parameters, or None
+        column_names: Table columns in order, including feature_id
+    
+    Returns:
+        pd.DataFrame: Matrix with feature_id values as index
+    """
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    params = params or []
+    
+    fid_pos = column_names.index("feature_id")
+    sample_cols = [name for name in column_names if name != "feature_id"]
+    
+    n_rows = cursor.execute(f"SELECT COUNT(*) FROM ({query})", params).fetchone()[0]
+    values = np.empty((n_rows, len(sample_cols)), dtype=np.float64)
+    feature_ids: List[str] = []
+    
+    cursor.execute(query, params)
+    n_read = 0
+    while True:
+        batch = cursor.fetchmany(_FETCH_BATCH_SIZE)
+        if not batch:
+            break
+        
+        block = np.array(batch, dtype=object)
+        end = n_read + len(block)
+        if end > len(values):
+            # Table grew between the count and the read
+            values = np.concatenate(
+                [values[:n_read], np.empty((end - n_read, len(sample_cols)))]
+            )
+        
+        feature_ids.extend(block[:, fid_pos])
+        values[n_read:end] = np.delete(block, fid_pos, axis=1)
+        n_read = end
+    
+    return pd.DataFrame(
+        values[:n_read],
+        index=pd.Index(feature_ids, name="feature_id"),
+        columns=sample_cols,
+        copy=False
+    )
+
+
+def _query_matrix(
+    conn: sqlite3.Connection,
+    db_path: Path,
+    table_name: str,
+    features: Optional[List[str]],
+    is_blob: bool,
+    column_info: List[Tuple[str, str]]
+) -> pd.DataFrame:
+    """
+    Query a matrix table, optionally restricted to a list of features.
+    
+    Args:
+        conn: Database connection
+        db_path: Path to the SQLite database file
+        table_name: Name of the matrix table
+        features: Feature IDs to retrieve, or None for all
+        is_blob: Whether the table uses the BLOB layout
+        column_info: (name, declared type) of each table column
+    
+    Returns:
+        pd.DataFrame: Query result; feature_id is the index, except for tables
+        read through pandas where it is still a column. All rows come back in
+        stored order, a list of features ordered by feature_id.
+    """
+    # Build query
+    feature_table = None
+    if features is None:
+        from_clause = f"FROM {table_name} t"
+        params = None
+    elif len(features) > _MAX_INLINE_FEATURES:
+        # Long feature lists are joined against an indexed temp table,
+        # which also avoids SQLite's bound-parameter limit
+        feature_table = _load_feature_table(conn, features)
+        from_clause = (
+            f"FROM {table_name} t "
+            f"JOIN {feature_table} f ON t.feature_id = f.feature_id"
+        )
+        params = None
+    else:
+        # Use parameterized query to prevent SQL injection
+        placeholders = ", ".join(["?" for _ in features])
+        from_clause = f"FROM {table_name} t WHERE t.feature_id IN ({placeholders})"
+        params = list(features)
+    
+    # All rows are read in rowid (stored) order
+    if features is not None:
+        from_clause += " ORDER BY t.feature_id"
+    
+    column_names = [name for name, _ in column_info]
+    query = f"SELECT t.* {from_clause}"
+    
+    try:
+        # BLOB layout rows are decoded with np.frombuffer; matrices stored with
+        # REAL sample columns are decoded straight into a preallocated float64
+        # array; anything else goes through pandas
+        if is_blob:
+            return _read_blob_matrix(conn, db_path, table_name, from_clause, params)
+        if "feature_id" in column_names and all(
+            decl_type == "REAL" for name, decl_type in column_info if name != "feature_id"
+        ):
+            try:
+                return _read_real_matrix(conn, query, params, column_names)
+            except (TypeError, ValueError) as e:
+                # SQLite doesn't enforce column types, so a REAL column can
+                # still hold text; such tables are read through pandas
+                logger.debug(f"Reading '{table_name}' through pandas: {e}")
+        if params:
+            return pd.read_sql_query(query, conn, params=params)
+        return pd.read_sql_query(query, conn)
+    
+    finally:
+        if feature_table is not None:
+            conn.execute(f"DROP TABLE IF EXISTS {feature_table}")
+            conn.commit()
+
+
+def _query_matrix_parallel(
+    db_path: Path,
+    table_name: str,
+    features: List[str],
+    is_blob: bool,
+    column_info: List[Tuple[str, str]],
+    n_threads: int
+) -> pd.DataFrame:
+    """
+    Query a list of features split across threads.
+    
+    Features are split into contiguous shards; each worker thread opens its
+    own read-only connection, since SQLite serializes calls on a connection.
+    
+    Args:
+        db_path: Path to the SQLite database file
+        table_name: Name of the matrix table
+        features: Feature IDs to retrieve
+        is_blob: Whether the table uses the BLOB layout
+        column_info: (name, declared type) of each table column
+        n_threads: Maximum number of worker threads
+    
+    Returns:
+        pd.DataFrame: Concatenated query results, as returned by _query_matrix
+        (rows ordered by feature_id, like a single-threaded query)
+    """
+    # Drop duplicates so that no feature is returned by two shards
+    features = list(dict.fromkeys(features))
+    n_shards = min(n_threads, len(features))
+    shard_size = -(-len(features) // n_shards)
+    shards = [features[i:i + shard_size] for i in range(0, len(features), shard_size)]
+    abs_path = db_path.resolve()
+    
+    def _worker(shard: List[str]) -> pd.DataFrame:
+        conn = _open_read_only(abs_path, decode_blobs=is_blob)
+        try:
+            return _query_matrix(conn, db_path, table_name, shard, is_blob, column_info)
+        finally:
+            conn.close()
+    
+    with ThreadPoolExecutor(max_workers=len(shards)) as executor:
+        results = list(executor.map(_worker, shards))
+    
+    frames = [df for df in results if not df.empty] or results[:1]
+    df = pd.concat(frames)
+    if len(frames) > 1:
+        # Each shard is ordered by feature_id; merge them into that order
+        feature_ids = (df.index if df.index.name == "feature_id" else df["feature_id"]).tolist()
+        order = sorted(range(len(feature_ids)), key=lambda i: _sqlite_sort_key(feature_ids[i]))
+        df = df.iloc[order]
+    return df
+
+
+def _sqlite_sort_key(value: Any) -> Tuple[int, Any]:
+    """Sort key ordering values like SQLite: NULL, numbers, text, then BLOBs."""
+    if value is None:
+        return (0, 0)
+    if isinstance(value, (int, float)):
+        return (1, value)
+    if isinstance(value, str):
+        return (2, value)
+    return (3, value)
+
+
 def retrieve_matrix_from_database(
     db_path: Union[str, Path],
     table_name: str,
-    features: Optional[List[str]] = None
+    features: Optional[List[str]] = None,
+    n_threads: int = 1
 ) -> Optional[pd.DataFrame]:
     """
     Retrieve a matrix from SQLite database, reconstructing the original format.
@@ -231,9 +1167,14 @@ def retrieve_matrix_from_database(
         db_path: Path to the SQLite database file
         table_name: Name of the table containing the matrix data
         features: Optional list of specific feature IDs to retrieve. If None, retrieves all
+        n_threads: Number of threads to split a features list across (default: 1).
+                   Each thread reads its share through its own read-only connection,
+                   which helps on cold caches and large databases.
     
     Returns:
-        pd.DataFrame: DataFrame with feature_id values as index, or None if no data found
+        pd.DataFrame: DataFrame with feature_id values as index, or None if no data found.
+                      All rows are returned in the order they were stored; a
+                      features list returns its rows ordered by feature_id.
     
     Raises:
         DROMAConnectionError: If database file not found or connection fails
@@ -277,58 +1218,56 @@ def retrieve_matrix_from_database(
             "features must be a list or tuple of feature IDs, or None"
         )
     
-    # Connect to database
-    try:
-        conn = sqlite3.connect(str(db_path))
-        conn.row_factory = sqlite3.Row
-    except sqlite3.Error as e:
-        raise DROMAConnectionError(
-            f"Failed to connect to database: {db_path}",
-            str(e)
+    if not isinstance(n_threads, int) or n_threads < 1:
+        raise DROMAValidationError(
+            "n_threads must be a positive integer"
         )
     
-    try:
-        # Check if table exists
-        cursor = conn.cursor()
-        cursor.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
-            (table_name,)
+    # Get (cached) read-only connection
+    conn = _get_conn(db_path)
+    
+    # Check if table exists
+    cursor = conn.cursor()
+    cursor.execute(
+        "SELECT name FROM sqlite_master WHERE type='table' AND name=?",
+        (table_name,)
+    )
+    if cursor.fetchone() is None:
+        # Get list of available tables
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+        available_tables = [row[0] for row in cursor.fetchall()]
+        raise DROMATableError(
+            f"Table '{table_name}' not found in database",
+            f"Available tables: {', '.join(available_tables) if available_tables else 'none'}"
         )
-        if cursor.fetchone() is None:
-            # Get list of available tables
-            cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-            available_tables = [row[0] for row in cursor.fetchall()]
-            raise DROMATableError(
-                f"Table '{table_name}' not found in database",
-                f"Available tables: {', '.join(available_tables) if available_tables else 'none'}"
-            )
+    
+    # map() keeps the per-element isinstance call in C
+    if features is not None and not all(map(isinstance, features, repeat(str))):
+        raise DROMAValidationError(
+            "All features must be strings"
+        )
+    
+    # Execute query
+    try:
+        # The BLOB layout is recognized from the table's own columns
+        column_info = _table_columns(conn, table_name)
+        is_blob = _is_blob_layout(column_info)
+        if is_blob:
+            conn = _get_conn(db_path, decode_blobs=True)
         
-        # Build query
-        if features is None:
-            query = f"SELECT * FROM {table_name}"
-            params = None
+        if n_threads > 1 and features is not None and len(features) > 1:
+            df = _query_matrix_parallel(
+                db_path, table_name, features, is_blob, column_info, n_threads
+            )
         else:
-            if not all(isinstance(f, str) for f in features):
-                raise DROMAValidationError(
-                    "All features must be strings"
-                )
-            # Use parameterized query to prevent SQL injection
-            placeholders = ", ".join(["?" for _ in features])
-            query = f"SELECT * FROM {table_name} WHERE feature_id IN ({placeholders})"
-            params = features
+            df = _query_matrix(conn, db_path, table_name, features, is_blob, column_info)
         
-        # Execute query
-        try:
-            if params:
-                df = pd.read_sql_query(query, conn, params=params)
-            else:
-                df = pd.read_sql_query(query, conn)
-            
-            if df.empty:
-                logger.warning(f"No data retrieved for table '{table_name}'")
-                return None
-            
-            # Check if feature_id column exists
+        if df.empty:
+            logger.warning(f"No data retrieved for table '{table_name}'")
+            return None
+        
+        # Check if feature_id column exists
+        if df.index.name != "feature_id":
             if "feature_id" not in df.columns:
                 raise DROMADataError(
                     f"Table '{table_name}' does not have a feature_id column",
@@ -336,20 +1275,17 @@ def retrieve_matrix_from_database(
                 )
             
             # Set feature_id as index
-            df = df.set_index("feature_id")
-            
-            logger.info(f"Retrieved matrix: {len(df)} features × {len(df.columns)} samples")
-            
-            return df
-            
-        except pd.errors.DatabaseError as e:
-            raise DROMADataError(
-                f"Failed to retrieve matrix from table '{table_name}'",
-                str(e)
-            )
-    
-    finally:
-        conn.close()
+            df.set_index("feature_id", inplace=True)
+        
+        logger.info(f"Retrieved matrix: {len(df)} features × {len(df.columns)} samples")
+        
+        return df
+        
+    except (pd.errors.DatabaseError, sqlite3.Error) as e:
+        raise DROMADataError(
+            f"Failed to retrieve matrix from table '{table_name}'",
+            str(e)
+        )
 
 
 def list_matrix_tables(
@@ -391,75 +1327,119 @@ def list_matrix_tables(
             "Check the file path"
         )
     
-    # Connect to database
-    try:
-        conn = sqlite3.connect(str(db_path))
-        conn.row_factory = sqlite3.Row
-    except sqlite3.Error as e:
-        raise DROMAConnectionError(
-            f"Failed to connect to database: {db_path}",
-            str(e)
-        )
+    # Get (cached) read-only connection
+    conn = _get_conn(db_path)
     
-    try:
-        cursor = conn.cursor()
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        all_tables = [row[0] for row in cursor.fetchall()]
-        
-        if not all_tables:
-            logger.info("No tables found in database")
-            return pd.DataFrame(columns=["table_name", "n_features", "n_samples"])
-        
-        # Check if metadata table exists
-        if "matrix_metadata" in all_tables:
-            metadata = pd.read_sql_query("SELECT * FROM matrix_metadata", conn)
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
+    all_tables = [row[0] for row in cursor.fetchall()]
+    
+    if not all_tables:
+        logger.info("No tables found in database")
+        return pd.DataFrame(columns=["table_name", "n_features", "n_samples"])
+    
+    # Columns of all tables in a single pass over the schema
+    cursor.execute(
+        """
+        SELECT m.name, p.name, upper(coalesce(p.type, ''))
+        FROM sqlite_master m JOIN pragma_table_info(m.name) p
+        WHERE m.type = 'table'
+        ORDER BY m.name, p.cid
+        """
+    )
+    table_columns: Dict[str, List[Tuple[str, str]]] = {}
+    for table_name, column_name, column_type in cursor.fetchall():
+        table_columns.setdefault(table_name, []).append((column_name, column_type))
+    
+    # BLOB layout tables keep their sample names (and quantization
+    # parameters) in side tables, which are not reported as matrices
+    table_set = set(all_tables)
+    blob_tables = {t for t in all_tables if _is_blob_layout(table_columns.get(t, []))}
+    hidden_tables = {
+        side_table
+        for t in blob_tables
+        for side_table in _blob_side_tables(t, table_columns)
+    }
+    
+    # Dimensions recorded by store_matrices_in_database; entries of tables
+    # dropped since are ignored
+    metadata = None
+    if "matrix_metadata" in table_set:
+        metadata = pd.read_sql_query("SELECT * FROM matrix_metadata", conn)
+        metadata = metadata[metadata["table_name"].isin(table_set)].reset_index(drop=True)
+    known_tables = set(metadata["table_name"]) if metadata is not None else set()
+    
+    # Generate metadata on the fly for the remaining tables
+    matrix_tables = [t for t in all_tables 
+                    if t != "matrix_metadata" and not t.startswith("sqlite_")
+                    and t not in hidden_tables and t not in known_tables]
+    
+    if not matrix_tables:
+        if metadata is not None:
             return metadata
-        
-        # Generate metadata on the fly
-        matrix_tables = [t for t in all_tables 
-                        if t not in ["matrix_metadata", "sqlite_sequence"]]
-        
-        if not matrix_tables:
-            logger.info("No matrix tables found in database")
-            return pd.DataFrame(columns=["table_name", "n_features", "n_samples"])
-        
-        metadata_list = []
-        
-        # Try to get dimensions for each table
-        for table_name in matrix_tables:
-            try:
-                # Validate table name (defensive check, though it came from database)
-                # This ensures we don't accidentally use malicious table names
-                if not re.match(r"^[a-zA-Z_][a-zA-Z0-9_]*$", table_name):
-                    logger.warning(f"Skipping table with invalid name: {table_name}")
-                    continue
-                
-                # Get row count (number of features)
-                # Note: table_name is from database, but we validate it for safety
-                cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-                n_features = cursor.fetchone()[0]
-                
-                # Get column count (subtract 1 for feature_id)
-                cursor.execute(f"PRAGMA table_info({table_name})")
-                col_info = cursor.fetchall()
-                n_samples = len([col for col in col_info if col[1] != "feature_id"])
-                
-                metadata_list.append({
-                    "table_name": table_name,
-                    "n_features": n_features,
-                    "n_samples": n_samples
-                })
-            except sqlite3.Error as e:
-                logger.warning(f"Could not get metadata for table '{table_name}': {e}")
-                metadata_list.append({
-                    "table_name": table_name,
-                    "n_features": None,
-                    "n_samples": None
-                })
-        
-        metadata_df = pd.DataFrame(metadata_list)
-        return metadata_df
+        logger.info("No matrix tables found in database")
+        return pd.DataFrame(columns=["table_name", "n_features", "n_samples"])
     
-    finally:
-        conn.close()
-
+    # Validate table names (defensive check, though they came from database)
+    # This ensures we don't accidentally use malicious table names
+    valid_tables = []
+    for table_name in matrix_tables:
+        if not _VALID_TABLE_RE.match(table_name):
+            logger.warning(f"Skipping table with invalid name: {table_name}")
+            continue
+        valid_tables.append(table_name)
+    
+    if not valid_tables:
+        if metadata is not None:
+            return metadata
+        return pd.DataFrame(columns=["table_name", "n_features", "n_samples"])
+    
+    # Number of samples = columns other than feature_id
+    sample_counts: Dict[str, Optional[int]] = {
+        table_name: sum(name != "feature_id" for name, _ in columns)
+        for table_name, columns in table_columns.items()
+    }
+    
+    # Row counts (number of features, and number of samples of BLOB layout
+    # tables) with one UNION ALL query per batch
+    cols_tables = {
+        t: f"{t}{_BLOB_COLS_SUFFIX}" for t in valid_tables
+        if f"{t}{_BLOB_COLS_SUFFIX}" in hidden_tables
+    }
+    count_tables = valid_tables + list(cols_tables.values())
+    feature_counts = {}
+    for start in range(0, len(count_tables), _MAX_UNION_TABLES):
+        batch = count_tables[start:start + _MAX_UNION_TABLES]
+        count_query = " UNION ALL ".join(
+            f"SELECT ?, COUNT(*) FROM {table_name}" for table_name in batch
+        )
+        try:
+            cursor.execute(count_query, batch)
+            feature_counts.update({row[0]: row[1] for row in cursor.fetchall()})
+        except sqlite3.Error:
+            # Fall back to counting tables one by one so that a single
+            # unreadable table (e.g. a virtual table) doesn't hide the others
+            for table_name in batch:
+                try:
+                    cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
+                    feature_counts[table_name] = cursor.fetchone()[0]
+                except sqlite3.Error as e:
+                    logger.warning(f"Could not get metadata for table '{table_name}': {e}")
+    
+    # BLOB layout tables: samples are the rows of the side table
+    for table_name in blob_tables.intersection(valid_tables):
+        sample_counts[table_name] = feature_counts.get(cols_tables.get(table_name))
+    
+    metadata_list = []
+    for table_name in valid_tables:
+        has_counts = table_name in feature_counts
+        metadata_list.append({
+            "table_name": table_name,
+            "n_features": feature_counts[table_name] if has_counts else None,
+            "n_samples": sample_counts.get(table_name) if has_counts else None
+        })
+    
+    metadata_df = pd.DataFrame(metadata_list)
+    if metadata is not None:
+        metadata_df = pd.concat([metadata, metadata_df], ignore_index=True)
+    return metadata_df
@@ -6,18 +6,93 @@ against the DROMA database using fuzzy matching and name cleaning approaches.
 """
 
 import sqlite3
+import numpy as np
 import pandas as pd
 import re
-from typing import Optional, List, Dict, Union
+from functools import lru_cache
+from itertools import repeat
+from typing import Any, Callable, Optional, List, Dict, Tuple, Union
 import logging
 from rapidfuzz import fuzz, process
 
+try:
+    import ahocorasick
+except ImportError:  # optional dependency, used for partial matching
+    ahocorasick = None
+
+njit: Any
+try:
+    from numba import njit
+except ImportError:  # optional dependency, used for cleaning long names
+    njit = None
+
 from .database import get_global_connection
 from .exceptions import DROMAConnectionError, DROMATableError
 
 logger = logging.getLogger(__name__)
 
 
+# Patterns used by the name cleaners
+_CJK_RE = re.compile(r'[\u4e00-\u9fff]')
+_BRACKET_RE = re.compile(r'\[.*?\]')
+_WRAPPED_PAREN_RE = re.compile(r'^\s*\(.*\)\s*$')
+_PAREN_RE = re.compile(r'\s*\([^)]+\)')
+_OUTER_PAREN_RE = re.compile(r'^\s*\(|\)\s*$')
+_NONALNUM_RE = re.compile(r'[^a-z0-9]')
+_WHITESPACE_RE = re.compile(r'\s+')
+
+# Annotation tables repeat many names, so cleaned names are memoized
+_CLEAN_CACHE_SIZE = 131072
+
+# Names at least this long are filtered with the numba kernel (if available);
+# below it, the regex is faster than the kernel's call overhead
+_NUMBA_MIN_LENGTH = 64
+
+# Maximum number of cells of a fuzzy-matching score matrix block
+_FUZZY_BLOCK_SIZE = 1 << 22
+
+# Prepared annotation references, keyed by (database file, table name) and
+# stored with the connection and the version (see _annotation_cache_key) they
+# were built from; one entry per table, so few connections are kept alive
+_ANNO_CACHE: Dict[tuple, Tuple[sqlite3.Connection, tuple, Dict]] = {}
+
+
+def _filter_alnum_bytes(buf: np.ndarray) -> np.ndarray:
+    """Keep the bytes 0-9 and a-z of a UTF-8 encoded name."""
+    out = np.empty_like(buf)
+    n = 0
+    for byte in buf:
+        if 48 <= byte <= 57 or 97 <= byte <= 122:
+            out[n] = byte
+            n += 1
+    return out[:n]
+
+
+# Compiled with numba when it is installed; the plain Python loop would be
+# slower than the regex
+_filter_alnum: Optional[Callable[[np.ndarray], np.ndarray]] = (
+    njit(cache=True)(_filter_alnum_bytes) if njit is not None else None
+)
+
+
+def _remove_non_alnum(name: str) -> str:
+    """
+    Remove every character except a-z and 0-9 from a lowercased name.
+    
+    Args:
+        name: Lowercased name
+        
+    Returns:
+        str: Name without other characters
+    """
+    if _filter_alnum is not None and len(name) >= _NUMBA_MIN_LENGTH:
+        # Bytes of multi-byte UTF-8 sequences are all >= 0x80, so filtering
+        # bytes removes the same characters as the regex
+        buf = np.frombuffer(name.encode('utf-8', 'surrogatepass'), dtype=np.uint8)
+        return _filter_alnum(buf).tobytes().decode('ascii')
+    return _NONALNUM_RE.sub('', name)
+
+
 def _clean_name(name: str) -> str:
     """
     Clean names for better matching.
@@ -31,27 +106,33 @@ def _clean_name(name: str) -> str:
     if pd.isna(name) or name is None:
         return ""
     
+    return _clean_name_impl(str(name))
+
+
+@lru_cache(maxsize=_CLEAN_CACHE_SIZE)
+def _clean_name_impl(name: str) -> str:
+    """Clean a non-missing name (cached implementation of _clean_name)."""
     # Convert to lowercase
-    name = str(name).lower()
+    name = name.lower()
     
     # Remove [?]
     name = name.replace("[?]", "")
     
     # Remove Chinese characters (if any)
-    name = re.sub(r'[\u4e00-\u9fff]', '', name)
+    name = _CJK_RE.sub('', name)
     
     # First remove [xx] format and its contents
-    name = re.sub(r'\[.*?\]', '', name)
+    name = _BRACKET_RE.sub('', name)
     
     # Handle parentheses - only remove if there's content outside them
-    if not re.match(r'^\s*\(.*\)\s*$', name):
-        name = re.sub(r'\s*\([^)]+\)', '', name)
+    if not _WRAPPED_PAREN_RE.match(name):
+        name = _PAREN_RE.sub('', name)
     else:
         # For names entirely in parentheses, remove the parentheses but keep content
-        name = re.sub(r'^\s*\(|\)\s*$', '', name)
+        name = _OUTER_PAREN_RE.sub('', name)
     
     # Remove special characters and extra spaces
-    name = re.sub(r'[^a-z0-9]', '', name)
+    name = _remove_non_alnum(name)
     name = name.strip()
     
     return name
@@ -70,35 +151,745 @@ def _clean_drug_name(name: str) -> str:
     if pd.isna(name) or name is None:
         return ""
     
+    return _clean_drug_name_impl(str(name))
+
+
+@lru_cache(maxsize=_CLEAN_CACHE_SIZE)
+def _clean_drug_name_impl(name: str) -> str:
+    """Clean a non-missing drug name (cached implementation of _clean_drug_name)."""
     # Convert to lowercase
-    name = str(name).lower()
+    name = name.lower()
     
     # Remove [?]
     name = name.replace("[?]", "")
     
     # Remove Chinese characters (if any)
-    name = re.sub(r'[\u4e00-\u9fff]', '', name)
+    name = _CJK_RE.sub('', name)
     
     # Handle parentheses - only remove if there's content outside them
-    if not re.match(r'^\s*\(.*\)\s*$', name):
-        name = re.sub(r'\s*\([^)]+\)', '', name)
+    if not _WRAPPED_PAREN_RE.match(name):
+        name = _PAREN_RE.sub('', name)
     else:
         # For names entirely in parentheses, remove the parentheses but keep content
-        name = re.sub(r'^\s*\(|\)\s*$', '', name)
+        name = _OUTER_PAREN_RE.sub('', name)
     
     # Remove special characters but keep spaces for drug names
-    name = re.sub(r'[^a-z0-9]', ' ', name)
-    name = re.sub(r'\s+', ' ', name)
+    name = _NONALNUM_RE.sub(' ', name)
+    name = _WHITESPACE_RE.sub(' ', name)
     name = name.strip()
     
     return name
 
 
+def _clean_series(
+    names: pd.Series,
+    cleaner: Callable[[str], str] = _clean_name
+) -> pd.Series:
+    """
+    Clean a column of names, cleaning each distinct value only once.
+    
+    Args:
+        names: Names to clean
+        cleaner: _clean_name or _clean_drug_name
+        
+    Returns:
+        pd.Series: Cleaned names (object dtype), aligned with names
+    """
+    values = names.to_numpy(dtype=object)
+    
+    # factorize() treats e.g. 1 and 1.0 as equal, but they clean differently
+    is_str = np.fromiter(map(isinstance, values, repeat(str)), dtype=bool, count=len(values))
+    if not is_str.all():
+        values = values.copy()
+        convert = ~is_str & ~pd.isna(values)
+        values[convert] = [str(value) for value in values[convert]]
+    
+    # Missing names get code -1, which picks the trailing ""
+    codes, uniques = pd.factorize(values)
+    cleaned = np.array([cleaner(name) for name in uniques] + [""], dtype=object)
+    return pd.Series(cleaned[codes], index=names.index, dtype=object)
+
+
+def _alternate_name_mapping(
+    sample_ids: pd.Series,
+    alternate_names: pd.Series
+) -> pd.DataFrame:
+    """
+    Expand the AlternateName column into one row per name.
+    
+    Each sample contributes a row for its SampleID followed by one row per
+    ':'- or '|'-separated alternate name, in table order.
+    
+    Args:
+        sample_ids: SampleID column
+        alternate_names: AlternateName column, aligned with sample_ids
+        
+    Returns:
+        pd.DataFrame: Columns raw_name, harmonized_name and clean_name
+    """
+    sample_ids = sample_ids.to_numpy(dtype=object)
+    alternate_names = alternate_names.to_numpy(dtype=object)
+    rows = np.arange(len(sample_ids))
+    has_alternates = ~pd.isna(alternate_names) & (alternate_names != "")
+    
+    own = pd.DataFrame({
+        'row': rows,
+        'raw_name': sample_ids,
+        'harmonized_name': sample_ids
+    })
+    alternates = pd.DataFrame({
+        'row': rows[has_alternates],
+        'raw_name': pd.Series(
+            [str(name) for name in alternate_names[has_alternates]], dtype=object
+        ).str.split(r'[:|]'),
+        'harmonized_name': sample_ids[has_alternates]
+    }).explode('raw_name')
+    alternates['raw_name'] = alternates['raw_name'].str.strip()
+    alternates = alternates[alternates['raw_name'].ne('') & alternates['raw_name'].ne('|')]
+    
+    # Stable sort keeps each sample's own name ahead of its alternates
+    mapping = pd.concat([own, alternates], ignore_index=True)
+    mapping = mapping.sort_values('row', kind='mergesort', ignore_index=True)
+    mapping['clean_name'] = _clean_series(mapping['raw_name'])
+    return mapping[['raw_name', 'harmonized_name', 'clean_name']]
+
+
+def _first_match_map(keys: pd.Series, values: pd.Series) -> Dict[str, str]:
+    """
+    Map each cleaned name to the value of the first row it appears in.
+    
+    Args:
+        keys: Cleaned reference names
+        values: Harmonized names, aligned with keys
+        
+    Returns:
+        Dict[str, str]: First-wins mapping, as .iloc[0] on a filtered frame
+    """
+    # dict() keeps the last value of a repeated key, so insert in reverse
+    return dict(zip(keys.tolist()[::-1], values.tolist()[::-1]))
+
+
+class _SuffixAutomaton:
+    """
+    Generalized suffix automaton over a list of names.
+    
+    Each state records the index of the first name containing its
+    substrings, so looking up a needle takes O(len(needle)) regardless of
+    the number of names. Used for partial matching when pyahocorasick is not
+    installed; it is built once per cached annotation reference.
+    """
+    
+    def __init__(self, names: List[str]):
+        transitions: List[Dict[str, int]] = [{}]
+        links = [-1]
+        lengths = [0]
+        
+        def add_state(length: int, state_transitions: Dict[str, int], link: int) -> int:
+            transitions.append(state_transitions)
+            links.append(link)
+            lengths.append(length)
+            return len(transitions) - 1
+        
+        for name in names:
+            last = 0
+            for char in name:
+                # Substring already known from an earlier name
+                if char in transitions[last]:
+                    q = transitions[last][char]
+                    if lengths[last] + 1 == lengths[q]:
+                        last = q
+                        continue
+                    clone = add_state(lengths[last] + 1, dict(transitions[q]), links[q])
+                    p = last
+                    while p != -1 and transitions[p].get(char) == q:
+                        transitions[p][char] = clone
+                        p = links[p]
+                    links[q] = clone
+                    last = clone
+                    continue
+                
+                cur = add_state(lengths[last] + 1, {}, 0)
+                p = last
+                while p != -1 and char not in transitions[p]:
+                    transitions[p][char] = cur
+                    p = links[p]
+                if p != -1:
+                    q = transitions[p][char]
+                    if lengths[p] + 1 == lengths[q]:
+                        links[cur] = q
+                    else:
+                        clone = add_state(lengths[p] + 1, dict(transitions[q]), links[q])
+                        while p != -1 and transitions[p].get(char) == q:
+                            transitions[p][char] = clone
+                            p = links[p]
+                        links[q] = clone
+                        links[cur] = clone
+                last = cur
+        
+        # Mark the states of each name's substrings, in name order; a marked
+        # state's suffix links were marked along with it
+        first = [-1] * len(transitions)
+        first[0] = 0 if names else -1
+        for idx, name in enumerate(names):
+            state = 0
+            for char in name:
+                state = transitions[state][char]
+                marked = state
+                while marked > 0 and first[marked] < 0:
+                    first[marked] = idx
+                    marked = links[marked]
+        
+        self._transitions = transitions
+        self._first = first
+    
+    def first_containing(self, needle: str) -> int:
+        """
+        Find the first name containing needle.
+        
+        Args:
+            needle: Substring to look up
+            
+        Returns:
+            int: Index of the first name containing needle, or -1
+        """
+        state = 0
+        for char in needle:
+            next_state = self._transitions[state].get(char)
+            if next_state is None:
+                return -1
+            state = next_state
+        return self._first[state]
+
+
+def _exact_match_map(stages: List[tuple]) -> Dict[str, tuple]:
+    """
+    Merge the exact-match lookup tables into a single one.
+    
+    Args:
+        stages: (lookup table, match type) pairs, highest priority first
+        
+    Returns:
+        Dict[str, tuple]: Mapping of each cleaned name to (harmonized name,
+                          match type) of the highest-priority table holding it
+    """
+    exact_map: Dict[str, tuple] = {}
+    # Later updates overwrite earlier ones, so insert lowest priority first
+    for lookup, match_type in reversed(stages):
+        exact_map.update(zip(lookup, zip(lookup.values(), repeat(match_type))))
+    return exact_map
+
+
+def _first_containing(needles: List[str], reference: Dict, column: str) -> Dict[str, int]:
+    """
+    Find the first reference name containing each cleaned input name.
+    
+    With pyahocorasick installed, all needles are searched in a single pass
+    over the reference names; otherwise each needle is looked up in a suffix
+    automaton of the reference names, built on first use and kept with the
+    reference.
+    
+    Args:
+        needles: Cleaned input names
+        reference: Prepared annotation reference
+        column: Cleaned name column of the reference to search, as keyed in
+                reference['partial_choices']
+        
+    Returns:
+        Dict[str, int]: Index of the first reference name containing each
+                        needle, for the needles found
+    """
+    first: Dict[str, int] = {}
+    pending = set(needles)
+    haystacks = reference['partial_choices'][column]
+    if not pending or not haystacks:
+        return first
+    
+    # The empty name is contained in every reference name
+    if "" in pending:
+        first[""] = 0
+        pending.discard("")
+    if not pending:
+        return first
+    
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for needle in pending:
+            automaton.add_word(needle, needle)
+        automaton.make_automaton()
+        remaining = len(pending)
+        for idx, haystack in enumerate(haystacks):
+            for _, needle in automaton.iter(haystack):
+                if needle not in first:
+                    first[needle] = idx
+                    remaining -= 1
+            if not remaining:
+                break
+    else:
+        suffix_automata = reference.setdefault('suffix_automata', {})
+        if column not in suffix_automata:
+            suffix_automata[column] = _SuffixAutomaton(haystacks)
+        suffix_automaton = suffix_automata[column]
+        for needle in pending:
+            idx = suffix_automaton.first_containing(needle)
+            if idx >= 0:
+                first[needle] = idx
+    
+    return first
+
+
+def _fuzzy_best_matches(
+    queries: List[str],
+    choices: List[str],
+    score_cutoff: int,
+    workers: int = -1
+) -> np.ndarray:
+    """
+    Find the best fuzzy match of each query among the choices.
+    
+    Scores are computed with one batched process.cdist call per block of
+    queries, the block size bounding the score matrix to about
+    _FUZZY_BLOCK_SIZE cells. Names are already cleaned, so no processor is
+    applied. Results match process.extractOne with scorer=fuzz.ratio: the
+    first choice with the highest score wins.
+    
+    Args:
+        queries: Cleaned names to match
+        choices: Cleaned reference names
+        score_cutoff: Minimum fuzz.ratio score (0-100) of a match
+        workers: Number of threads scoring queries in parallel (-1: all cores)
+        
+    Returns:
+        np.ndarray: Index into choices of each query's best match, or -1 if
+                    no choice reaches score_cutoff
+    """
+    best = np.full(len(queries), -1, dtype=np.intp)
+    if not queries or not choices:
+        return best
+    
+    block_size = max(1, _FUZZY_BLOCK_SIZE // len(choices))
+    for start in range(0, len(queries), block_size):
+        # float64 scores are identical to the ones extractOne compares
+        scores = process.cdist(
+            queries[start:start + block_size],
+            choices,
+            scorer=fuzz.ratio,
+            processor=None,
+            score_cutoff=score_cutoff,
+            dtype=np.float64,
+            workers=workers
+        )
+        match_idx = scores.argmax(axis=1)
+        is_match = scores[np.arange(len(match_idx)), match_idx] >= score_cutoff
+        best[start:start + len(match_idx)] = np.where(is_match, match_idx, -1)
+    
+    return best
+
+
+def _factorize_names(names: List[str]) -> tuple:
+    """
+    Deduplicate input names, keeping their first-seen order.
+    
+    Args:
+        names: Input names
+        
+    Returns:
+        tuple: (distinct names, np.ndarray of each name's index into them)
+    """
+    unique_names = list(dict.fromkeys(names))
+    positions = {name: idx for idx, name in enumerate(unique_names)}
+    codes = np.fromiter(map(positions.__getitem__, names), dtype=np.intp, count=len(names))
+    return unique_names, codes
+
+
+def _annotation_cache_key(
+    connection: sqlite3.Connection,
+    table_name: str
+) -> Optional[tuple]:
+    """
+    Identify an annotation table and the current version of its content.
+    
+    The version is the database's schema version (changed when a table is
+    dropped or replaced), its data version (changed when another connection
+    commits), and the connection's total number of changed rows (changed by
+    every INSERT, UPDATE, or DELETE made through this connection).
+    
+    Args:
+        connection: Database connection
+        table_name: Name of the annotation table
+        
+    Returns:
+        Optional[tuple]: (cache key, version), or None for in-memory databases
+    """
+    db_file = ""
+    for row in connection.execute("PRAGMA database_list"):
+        if row[1] == "main":
+            db_file = row[2]
+    # In-memory databases have no file name to tell them apart
+    if not db_file:
+        return None
+    
+    version = (
+        connection.execute("PRAGMA schema_version").fetchone()[0],
+        connection.execute("PRAGMA data_version").fetchone()[0],
+        connection.total_changes
+    )
+    return (db_file, table_name), version
+
+
+def _load_annotation_reference(
+    connection: sqlite3.Connection,
+    table_name: str,
+    columns: List[str],
+    prepare: Callable[[pd.DataFrame], Dict]
+) -> Optional[Dict]:
+    """
+    Load and prepare an annotation table, reusing the cached preparation
+    while the table is unchanged.
+    
+    Only the name columns used for matching are read; columns missing from
+    the table's schema are left out.
+    
+    Args:
+        connection: Database connection
+        table_name: Name of the annotation table
+        columns: Columns to read
+        prepare: Function building the reference from the annotation frame
+        
+    Returns:
+        Optional[Dict]: Prepared reference, or None if the table is empty
+    """
+    cache_key = _annotation_cache_key(connection, table_name)
+    if cache_key is not None:
+        key, version = cache_key
+        cached = _ANNO_CACHE.get(key)
+        # The data version is only comparable on the connection that read it
+        if cached is not None and cached[0] is connection and cached[1] == version:
+            return cached[2]
+    
+    table_columns = {row[1] for row in connection.execute(f"PRAGMA table_info({table_name})")}
+    select_columns = ", ".join(f'"{column}"' for column in columns if column in table_columns)
+    anno = pd.read_sql_query(f"SELECT {select_columns} FROM {table_name}", connection)
+    if anno.empty:
+        return None
+    
+    reference = prepare(anno)
+    if cache_key is not None:
+        _ANNO_CACHE[key] = (connection, version, reference)
+    return reference
+
+
+def _fuzzy_stage(
+    names_frame: pd.DataFrame,
+    clean_col: str,
+    name_col: str,
+    match_type: str
+) -> tuple:
+    """
+    Collect the choices of one fuzzy-matching stage.
+    
+    Args:
+        names_frame: Reference names
+        clean_col: Column holding the cleaned names to match against
+        name_col: Column holding the harmonized name of each row
+        match_type: Match type reported for matches of this stage
+        
+    Returns:
+        tuple: (cleaned choices, harmonized names, match_type)
+    """
+    valid = names_frame[clean_col].notna()
+    return (
+        names_frame.loc[valid, clean_col].tolist(),
+        names_frame.loc[valid, name_col].tolist(),
+        match_type
+    )
+
+
+def _prepare_sample_reference(sample_anno: pd.DataFrame) -> Dict:
+    """
+    Clean the sample_anno names and build the lookup tables used for matching.
+    
+    Args:
+        sample_anno: Sample annotation data
+        
+    Returns:
+        Dict: Exact-match lookup tables and the choices of the fuzzy and
+              partial matching stages
+    """
+    sample_anno['clean_sampleid'] = _clean_series(sample_anno['SampleID'])
+    sample_anno['clean_rawname'] = _clean_series(sample_anno['ProjectRawName'])
+    
+    # Handle AlternateName column if it exists
+    alternate_mapping = pd.DataFrame()
+    if 'AlternateName' in sample_anno.columns:
+        alternate_mapping = _alternate_name_mapping(
+            sample_anno['SampleID'], sample_anno['AlternateName']
+        )
+    
+    exact_stages = [
+        (_first_match_map(sample_anno['clean_sampleid'], sample_anno['SampleID']), 'exact_sampleid'),
+        (_first_match_map(sample_anno['clean_rawname'], sample_anno['SampleID']), 'exact_rawname'),
+    ]
+    if not alternate_mapping.empty:
+        exact_stages.append((
+            _first_match_map(alternate_mapping['clean_name'], alternate_mapping['harmonized_name']),
+            'exact_alternate'
+        ))
+    
+    # Fuzzy matching tries SampleID, then ProjectRawName, then AlternateName
+    fuzzy_stages = [
+        _fuzzy_stage(sample_anno, 'clean_sampleid', 'SampleID', 'fuzzy_sampleid'),
+        _fuzzy_stage(sample_anno, 'clean_rawname', 'SampleID', 'fuzzy_rawname'),
+    ]
+    if not alternate_mapping.empty:
+        fuzzy_stages.append(
+            _fuzzy_stage(alternate_mapping, 'clean_name', 'harmonized_name', 'fuzzy_alternate')
+        )
+    
+    return {
+        'exact_map': _exact_match_map(exact_stages),
+        'fuzzy_stages': fuzzy_stages,
+        # Partial matching tries SampleID, then ProjectRawName
+        'partial_stages': [
+            ('clean_sampleid', 'partial_sampleid'),
+            ('clean_rawname', 'partial_rawname'),
+        ],
+        'partial_choices': {
+            'clean_sampleid': sample_anno['clean_sampleid'].tolist(),
+            'clean_rawname': sample_anno['clean_rawname'].tolist()
+        },
+        'names': sample_anno['SampleID'].tolist()
+    }
+
+
+def _prepare_drug_reference(drug_anno: pd.DataFrame) -> Dict:
+    """
+    Clean the drug_anno names and build the lookup tables used for matching.
+    
+    Args:
+        drug_anno: Drug annotation data
+        
+    Returns:
+        Dict: Exact-match lookup tables and the choices of the fuzzy and
+              partial matching stages
+    """
+    drug_anno['clean_drugname'] = _clean_series(drug_anno['DrugName'], _clean_drug_name)
+    drug_anno['clean_rawname'] = _clean_series(drug_anno['ProjectRawName'], _clean_drug_name)
+    
+    return {
+        'exact_map': _exact_match_map([
+            (_first_match_map(drug_anno['clean_drugname'], drug_anno['DrugName']), 'exact_drugname'),
+            (_first_match_map(drug_anno['clean_rawname'], drug_anno['DrugName']), 'exact_rawname'),
+        ]),
+        # Fuzzy matching tries DrugName, then ProjectRawName
+        'fuzzy_stages': [
+            _fuzzy_stage(drug_anno, 'clean_drugname', 'DrugName', 'fuzzy_drugname'),
+            _fuzzy_stage(drug_anno, 'clean_rawname', 'DrugName', 'fuzzy_rawname'),
+        ],
+        # Partial matching tries DrugName, then ProjectRawName
+        'partial_stages': [
+            ('clean_drugname', 'partial_drugname'),
+            ('clean_rawname', 'partial_rawname'),
+        ],
+        'partial_choices': {
+            'clean_drugname': drug_anno['clean_drugname'].tolist(),
+            'clean_rawname': drug_anno['clean_rawname'].tolist()
+        },
+        'names': drug_anno['DrugName'].tolist()
+    }
+
+
+def _harmonize_names(
+    names: List[str],
+    reference: Optional[Dict],
+    cleaner: Callable[[str], str],
+    long_name_threshold: int,
+    max_distance: float,
+    min_name_length: int,
+    workers: int,
+    label: str
+) -> pd.DataFrame:
+    """
+    Match names against a prepared annotation reference.
+    
+    Each name is tried against the exact-match lookup table, then the fuzzy
+    stages, then the partial stages of the reference, in their priority
+    order.
+    
+    Args:
+        names: Names to check and harmonize
+        reference: Prepared annotation reference, or None if the annotation
+                   table is empty
+        cleaner: _clean_name or _clean_drug_name
+        long_name_threshold: Names longer than this are kept as original
+        max_distance: Maximum distance for fuzzy matching
+        min_name_length: Minimum name length for partial matching
+        workers: Number of threads used for fuzzy matching
+        label: 'Sample' or 'Drug', used in log messages
+        
+    Returns:
+        pd.DataFrame: DataFrame with columns: original_name, cleaned_name,
+                     harmonized_name, match_type, match_confidence, new_name
+    """
+    if reference is None:
+        logger.warning(f"{label} annotation table is empty")
+        # Return basic mapping with no matches
+        result = pd.DataFrame({
+            'original_name': names,
+            'cleaned_name': [cleaner(name) for name in names],
+            'harmonized_name': names,
+            'match_type': 'no_match',
+            'match_confidence': 'none',
+            'new_name': names
+        })
+        return result
+    
+    # Each distinct name is matched once; results are scattered back to the
+    # input positions at the end
+    unique_names, codes = _factorize_names(names)
+    
+    # Clean input names
+    names_clean = [cleaner(name) for name in unique_names]
+    
+    exact_map = reference['exact_map']
+    
+    # Result columns, filled in by position one matching stage at a time
+    harmonized_names = np.empty(len(unique_names), dtype=object)
+    match_types = np.empty(len(unique_names), dtype=object)
+    match_confidences = np.empty(len(unique_names), dtype=object)
+    new_names = np.empty(len(unique_names), dtype=object)
+    fuzzy_pending = []
+    partial_pending = []
+    
+    # Exact matches
+    for i, original_name in enumerate(unique_names):
+        clean_name = names_clean[i]
+        
+        # For very long names, keep original
+        if len(original_name) > long_name_threshold:
+            harmonized_names[i] = original_name
+            match_types[i] = 'keep_original_long'
+            match_confidences[i] = 'medium'
+            new_names[i] = original_name
+            continue
+        
+        exact = exact_map.get(clean_name)
+        if exact is not None:
+            harmonized, match_type = exact
+            harmonized_names[i] = harmonized
+            match_types[i] = match_type
+            match_confidences[i] = 'high'
+            new_names[i] = harmonized
+        
+        elif len(clean_name) >= 3:
+            fuzzy_pending.append(i)
+        else:
+            partial_pending.append(i)
+    
+    # Fuzzy matches, scored in batches one stage at a time for the names
+    # still unmatched. The cutoff lets rapidfuzz skip the full computation
+    # for choices that cannot reach it
+    score_cutoff = int((1-max_distance) * 100)
+    for choices, stage_names, match_type in reference['fuzzy_stages']:
+        if not fuzzy_pending:
+            break
+        best = _fuzzy_best_matches(
+            [names_clean[i] for i in fuzzy_pending],
+            choices,
+            score_cutoff,
+            workers
+        )
+        still_pending = []
+        for i, match_idx in zip(fuzzy_pending, best):
+            if match_idx < 0:
+                still_pending.append(i)
+                continue
+            harmonized = stage_names[match_idx]
+            harmonized_names[i] = harmonized
+            match_types[i] = match_type
+            match_confidences[i] = 'medium'
+            new_names[i] = harmonized
+        fuzzy_pending = still_pending
+    partial_pending.extend(fuzzy_pending)
+    
+    # Partial matches (name is contained in annotation), one stage at a time
+    # for the names not found by the previous stages
+    needles = [
+        names_clean[i] for i in partial_pending
+        if len(names_clean[i]) >= min_name_length
+    ]
+    partial_stages = []
+    for column, match_type in reference['partial_stages']:
+        found = _first_containing(needles, reference, column)
+        partial_stages.append((found, match_type))
+        needles = [name for name in needles if name not in found]
+    reference_names = reference['names']
+    
+    for i in partial_pending:
+        original_name = unique_names[i]
+        clean_name = names_clean[i]
+        
+        # Try partial match (name is contained in annotation)
+        matched = False
+        if len(clean_name) >= min_name_length:
+            for found, match_type in partial_stages:
+                if clean_name in found:
+                    harmonized = reference_names[found[clean_name]]
+                    harmonized_names[i] = harmonized
+                    match_types[i] = match_type
+                    match_confidences[i] = 'low'
+                    new_names[i] = harmonized
+                    matched = True
+                    break
+        
+        # No match found - use cleaned name
+        if not matched:
+            harmonized_names[i] = clean_name
+            match_types[i] = 'no_match'
+            match_confidences[i] = 'none'
+            new_names[i] = original_name
+    
+    result_df = pd.DataFrame({
+        'original_name': names,
+        'cleaned_name': np.asarray(names_clean, dtype=object)[codes],
+        'harmonized_name': harmonized_names[codes],
+        'match_type': match_types[codes],
+        'match_confidence': match_confidences[codes],
+        'new_name': new_names[codes]
+    })
+    
+    # Print summary; counting and formatting are skipped unless INFO
+    # messages are logged
+    log_info = logger.isEnabledFor(logging.INFO)
+    if log_info:
+        match_summary = result_df['match_type'].value_counts()
+        logger.info(f"{label} name matching summary:")
+        for match_type, count in match_summary.items():
+            logger.info(f"    {match_type}: {count}")
+    
+    # Warn about low confidence matches
+    is_low_confidence = result_df['match_confidence'].isin(['medium', 'low']).to_numpy()
+    n_low_confidence = int(is_low_confidence.sum())
+    if n_low_confidence:
+        logger.warning(
+            f"{n_low_confidence} {label.lower()}s have medium/low confidence matches."
+        )
+        if log_info:
+            logger.info("Consider manual review of these matches:")
+            low_confidence = result_df[is_low_confidence].head(5)
+            for row in low_confidence.itertuples(index=False):
+                logger.info(f"    {row.original_name} -> {row.harmonized_name} ({row.match_type})")
+            if n_low_confidence > 5:
+                logger.info(f"    ... and {n_low_confidence - 5} more")
+    
+    return result_df
+
+
 def check_droma_sample_names(
     sample_names: List[str],
     connection: Optional[sqlite3.Connection] = None,
     max_distance: float = 0.2,
-    min_name_length: int = 5
+    min_name_length: int = 5,
+    workers: int = -1
 ) -> pd.DataFrame:
     """
     Check sample names against the sample_anno table and provide harmonized mappings.
@@ -110,6 +901,7 @@ def check_droma_sample_names(
         connection: Optional database connection. If None, uses global connection
         max_distance: Maximum distance for fuzzy matching (default: 0.2)
         min_name_length: Minimum name length for partial matching (default: 5)
+        workers: Number of threads used for fuzzy matching (default: -1, all cores)
         
     Returns:
         pd.DataFrame: DataFrame with columns: original_name, cleaned_name, harmonized_name, 
@@ -133,247 +925,16 @@ def check_droma_sample_names(
     if "sample_anno" not in all_tables:
         raise DROMATableError("Sample annotation table 'sample_anno' not found in database")
     
-    # Get sample annotation data
-    sample_anno = pd.read_sql_query("SELECT * FROM sample_anno", connection)
+    # Get sample annotation data, cleaned and indexed for matching
+    reference = _load_annotation_reference(
+        connection, "sample_anno", ['SampleID', 'ProjectRawName', 'AlternateName'],
+        _prepare_sample_reference
+    )
     
-    if sample_anno.empty:
-        logger.warning("Sample annotation table is empty")
-        # Return basic mapping with no matches
-        result = pd.DataFrame({
-            'original_name': sample_names,
-            'cleaned_name': [_clean_name(name) for name in sample_names],
-            'harmonized_name': sample_names,
-            'match_type': 'no_match',
-            'match_confidence': 'none',
-            'new_name': sample_names
-        })
-        return result
-    
-    # Clean reference names in sample_anno
-    sample_anno['clean_sampleid'] = sample_anno['SampleID'].apply(_clean_name)
-    sample_anno['clean_rawname'] = sample_anno['ProjectRawName'].apply(_clean_name)
-    
-    # Handle AlternateName column if it exists
-    alternate_mapping = pd.DataFrame()
-    if 'AlternateName' in sample_anno.columns:
-        alt_data = []
-        for _, row in sample_anno.iterrows():
-            harmonized_name = row['SampleID']
-            
-            # Add the harmonized name itself
-            alt_data.append({
-                'raw_name': harmonized_name,
-                'harmonized_name': harmonized_name,
-                'clean_name': _clean_name(harmonized_name)
-            })
-            
-            # Process alternate names if they exist
-            if pd.notna(row['AlternateName']) and row['AlternateName'] != "":
-                alt_names = re.split(r'[:|]', str(row['AlternateName']))
-                alt_names = [name.strip() for name in alt_names if name.strip() and name.strip() != "|"]
-                
-                for alt_name in alt_names:
-                    alt_data.append({
-                        'raw_name': alt_name,
-                        'harmonized_name': harmonized_name,
-                        'clean_name': _clean_name(alt_name)
-                    })
-        
-        alternate_mapping = pd.DataFrame(alt_data)
-    
-    # Clean input sample names
-    sample_names_clean = [_clean_name(name) for name in sample_names]
-    
-    # Create result data frame
-    result_data = []
-    
-    # Match each sample name
-    for i, original_name in enumerate(sample_names):
-        clean_name = sample_names_clean[i]
-        
-        # For very long names, keep original
-        if len(original_name) > 30:
-            result_data.append({
-                'original_name': original_name,
-                'cleaned_name': clean_name,
-                'harmonized_name': original_name,
-                'match_type': 'keep_original_long',
-                'match_confidence': 'medium',
-                'new_name': original_name
-            })
-            continue
-        
-        matched = False
-        
-        # Try exact match with SampleID
-        exact_sampleid = sample_anno[sample_anno['clean_sampleid'] == clean_name]
-        if not exact_sampleid.empty:
-            harmonized = exact_sampleid.iloc[0]['SampleID']
-            result_data.append({
-                'original_name': original_name,
-                'cleaned_name': clean_name,
-                'harmonized_name': harmonized,
-                'match_type': 'exact_sampleid',
-                'match_confidence': 'high',
-                'new_name': harmonized
-            })
-            matched = True
-        
-        # Try exact match with ProjectRawName
-        elif not sample_anno[sample_anno['clean_rawname'] == clean_name].empty:
-            exact_rawname = sample_anno[sample_anno['clean_rawname'] == clean_name]
-            harmonized = exact_rawname.iloc[0]['SampleID']
-            result_data.append({
-                'original_name': original_name,
-                'cleaned_name': clean_name,
-                'harmonized_name': harmonized,
-                'match_type': 'exact_rawname',
-                'match_confidence': 'high',
-                'new_name': harmonized
-            })
-            matched = True
-        
-        # Try exact match with AlternateName if available
-        elif not alternate_mapping.empty and not alternate_mapping[alternate_mapping['clean_name'] == clean_name].empty:
-            exact_alternate = alternate_mapping[alternate_mapping['clean_name'] == clean_name]
-            harmonized = exact_alternate.iloc[0]['harmonized_name']
-            result_data.append({
-                'original_name': original_name,
-                'cleaned_name': clean_name,
-                'harmonized_name': harmonized,
-                'match_type': 'exact_alternate',
-                'match_confidence': 'high',
-                'new_name': harmonized
-            })
-            matched = True
-        
-        if not matched and len(clean_name) >= 3:
-            # Try fuzzy match with SampleID
-            choices = sample_anno['clean_sampleid'].dropna().tolist()
-            if choices:
-                best_match = process.extractOne(
-                    clean_name, choices, 
-                    scorer=fuzz.ratio,
-                    score_cutoff=int((1-max_distance) * 100)
-                )
-                if best_match:
-                    match_idx = sample_anno[sample_anno['clean_sampleid'] == best_match[0]].index[0]
-                    harmonized = sample_anno.loc[match_idx, 'SampleID']
-                    result_data.append({
-                        'original_name': original_name,
-                        'cleaned_name': clean_name,
-                        'harmonized_name': harmonized,
-                        'match_type': 'fuzzy_sampleid',
-                        'match_confidence': 'medium',
-                        'new_name': harmonized
-                    })
-                    matched = True
-            
-            # Try fuzzy match with ProjectRawName
-            if not matched:
-                choices = sample_anno['clean_rawname'].dropna().tolist()
-                if choices:
-                    best_match = process.extractOne(
-                        clean_name, choices,
-                        scorer=fuzz.ratio,
-                        score_cutoff=int((1-max_distance) * 100)
-                    )
-                    if best_match:
-                        match_idx = sample_anno[sample_anno['clean_rawname'] == best_match[0]].index[0]
-                        harmonized = sample_anno.loc[match_idx, 'SampleID']
-                        result_data.append({
-                            'original_name': original_name,
-                            'cleaned_name': clean_name,
-                            'harmonized_name': harmonized,
-                            'match_type': 'fuzzy_rawname',
-                            'match_confidence': 'medium',
-                            'new_name': harmonized
-                        })
-                        matched = True
-            
-            # Try fuzzy match with AlternateName if available
-            if not matched and not alternate_mapping.empty:
-                choices = alternate_mapping['clean_name'].dropna().tolist()
-                if choices:
-                    best_match = process.extractOne(
-                        clean_name, choices,
-                        scorer=fuzz.ratio,
-                        score_cutoff=int((1-max_distance) * 100)
-                    )
-                    if best_match:
-                        match_idx = alternate_mapping[alternate_mapping['clean_name'] == best_match[0]].index[0]
-                        harmonized = alternate_mapping.loc[match_idx, 'harmonized_name']
-                        result_data.append({
-                            'original_name': original_name,
-                            'cleaned_name': clean_name,
-                            'harmonized_name': harmonized,
-                            'match_type': 'fuzzy_alternate',
-                            'match_confidence': 'medium',
-                            'new_name': harmonized
-                        })
-                        matched = True
-        
-        # Try partial match (sample name is contained in annotation)
-        if not matched and len(clean_name) >= min_name_length:
-            # Check if sample name is contained in SampleID names
-            partial_sampleid = sample_anno[sample_anno['clean_sampleid'].str.contains(clean_name, na=False)]
-            if not partial_sampleid.empty:
-                harmonized = partial_sampleid.iloc[0]['SampleID']
-                result_data.append({
-                    'original_name': original_name,
-                    'cleaned_name': clean_name,
-                    'harmonized_name': harmonized,
-                    'match_type': 'partial_sampleid',
-                    'match_confidence': 'low',
-                    'new_name': harmonized
-                })
-                matched = True
-            
-            # Check if sample name is contained in ProjectRawName names
-            elif not sample_anno[sample_anno['clean_rawname'].str.contains(clean_name, na=False)].empty:
-                partial_rawname = sample_anno[sample_anno['clean_rawname'].str.contains(clean_name, na=False)]
-                harmonized = partial_rawname.iloc[0]['SampleID']
-                result_data.append({
-                    'original_name': original_name,
-                    'cleaned_name': clean_name,
-                    'harmonized_name': harmonized,
-                    'match_type': 'partial_rawname',
-                    'match_confidence': 'low',
-                    'new_name': harmonized
-                })
-                matched = True
-        
-        # No match found - use cleaned name
-        if not matched:
-            result_data.append({
-                'original_name': original_name,
-                'cleaned_name': clean_name,
-                'harmonized_name': clean_name,
-                'match_type': 'no_match',
-                'match_confidence': 'none',
-                'new_name': original_name
-            })
-    
-    result_df = pd.DataFrame(result_data)
-    
-    # Print summary
-    match_summary = result_df['match_type'].value_counts()
-    logger.info("Sample name matching summary:")
-    for match_type, count in match_summary.items():
-        logger.info(f"    {match_type}: {count}")
-    
-    # Warn about low confidence matches
-    low_confidence = result_df[result_df['match_confidence'].isin(['medium', 'low'])]
-    if not low_confidence.empty:
-        logger.warning(f"{len(low_confidence)} samples have medium/low confidence matches.")
-        logger.info("Consider manual review of these matches:")
-        for i in range(min(5, len(low_confidence))):
-            row = low_confidence.iloc[i]
-            logger.info(f"    {row['original_name']} -> {row['harmonized_name']} ({row['match_type']})")
-        if len(low_confidence) > 5:
-            logger.info(f"    ... and {len(low_confidence) - 5} more")
-    
-    return result_df
+    return _harmonize_names(
+        sample_names, reference, _clean_name, 30,
+        max_distance, min_name_length, workers, 'Sample'
+    )
 
 
 def check_droma_drug_names(
@@ -381,7 +942,8 @@ def check_droma_drug_names(
     connection: Optional[sqlite3.Connection] = None,
     max_distance: float = 0.2,
     min_name_length: int = 5,
-    keep_long_names_threshold: int = 17
+    keep_long_names_threshold: int = 17,
+    workers: int = -1
 ) -> pd.DataFrame:
     """
     Check drug names against the drug_anno table and provide harmonized mappings.
@@ -394,6 +956,7 @@ def check_droma_drug_names(
         max_distance: Maximum distance for fuzzy matching (default: 0.2)
         min_name_length: Minimum name length for partial matching (default: 5)
         keep_long_names_threshold: Names longer than this will be kept as original (default: 17)
+        workers: Number of threads used for fuzzy matching (default: -1, all cores)
         
     Returns:
         pd.DataFrame: DataFrame with columns: original_name, cleaned_name, harmonized_name, 
@@ -417,180 +980,30 @@ def check_droma_drug_names(
     if "drug_anno" not in all_tables:
         raise DROMATableError("Drug annotation table 'drug_anno' not found in database")
     
-    # Get drug annotation data
-    drug_anno = pd.read_sql_query("SELECT * FROM drug_anno", connection)
-    
-    if drug_anno.empty:
-        logger.warning("Drug annotation table is empty")
-        # Return basic mapping with no matches
-        result = pd.DataFrame({
-            'original_name': drug_names,
-            'cleaned_name': [_clean_drug_name(name) for name in drug_names],
-            'harmonized_name': drug_names,
-            'match_type': 'no_match',
-            'match_confidence': 'none',
-            'new_name': drug_names
-        })
-        return result
-    
-    # Clean reference names in drug_anno
-    drug_anno['clean_drugname'] = drug_anno['DrugName'].apply(_clean_drug_name)
-    drug_anno['clean_rawname'] = drug_anno['ProjectRawName'].apply(_clean_drug_name)
+    # Get drug annotation data, cleaned and indexed for matching
+    reference = _load_annotation_reference(
+        connection, "drug_anno", ['DrugName', 'ProjectRawName'],
+        _prepare_drug_reference
+    )
     
-    # Clean input drug names
-    drug_names_clean = [_clean_drug_name(name) for name in drug_names]
+    return _harmonize_names(
+        drug_names, reference, _clean_drug_name, keep_long_names_threshold,
+        max_distance, min_name_length, workers, 'Drug'
+    )
+
+
+def clear_harmonization_cache() -> None:
+    """
+    Clear the cached annotation references and cleaned names.
     
-    # Create result data frame
-    result_data = []
+    check_droma_sample_names and check_droma_drug_names reuse the prepared
+    annotation tables while the database is unchanged: same connection, same
+    schema, no commits from other connections, and no rows changed through
+    the connection itself. Clearing is only needed to free memory.
     
-    # Match each drug name
-    for i, original_name in enumerate(drug_names):
-        clean_name = drug_names_clean[i]
-        
-        # For very long drug names, keep original
-        if len(original_name) > keep_long_names_threshold:
-            result_data.append({
-                'original_name': original_name,
-                'cleaned_name': clean_name,
-                'harmonized_name': original_name,
-                'match_type': 'keep_original_long',
-                'match_confidence': 'medium',
-                'new_name': original_name
-            })
-            continue
-        
-        matched = False
-        
-        # Try exact match with DrugName
-        exact_drugname = drug_anno[drug_anno['clean_drugname'] == clean_name]
-        if not exact_drugname.empty:
-            harmonized = exact_drugname.iloc[0]['DrugName']
-            result_data.append({
-                'original_name': original_name,
-                'cleaned_name': clean_name,
-                'harmonized_name': harmonized,
-                'match_type': 'exact_drugname',
-                'match_confidence': 'high',
-                'new_name': harmonized
-            })
-            matched = True
-        
-        # Try exact match with ProjectRawName
-        elif not drug_anno[drug_anno['clean_rawname'] == clean_name].empty:
-            exact_rawname = drug_anno[drug_anno['clean_rawname'] == clean_name]
-            harmonized = exact_rawname.iloc[0]['DrugName']
-            result_data.append({
-                'original_name': original_name,
-                'cleaned_name': clean_name,
-                'harmonized_name': harmonized,
-                'match_type': 'exact_rawname',
-                'match_confidence': 'high',
-                'new_name': harmonized
-            })
-            matched = True
-        
-        if not matched and len(clean_name) >= 3:
-            # Try fuzzy match with DrugName
-            choices = drug_anno['clean_drugname'].dropna().tolist()
-            if choices:
-                best_match = process.extractOne(
-                    clean_name, choices,
-                    scorer=fuzz.ratio,
-                    score_cutoff=int((1-max_distance) * 100)
-                )
-                if best_match:
-                    match_idx = drug_anno[drug_anno['clean_drugname'] == best_match[0]].index[0]
-                    harmonized = drug_anno.loc[match_idx, 'DrugName']
-                    result_data.append({
-                        'original_name': original_name,
-                        'cleaned_name': clean_name,
-                        'harmonized_name': harmonized,
-                        'match_type': 'fuzzy_drugname',
-                        'match_confidence': 'medium',
-                        'new_name': harmonized
-                    })
-                    matched = True
-            
-            # Try fuzzy match with ProjectRawName
-            if not matched:
-                choices = drug_anno['clean_rawname'].dropna().tolist()
-                if choices:
-                    best_match = process.extractOne(
-                        clean_name, choices,
-                        scorer=fuzz.ratio,
-                        score_cutoff=int((1-max_distance) * 100)
-                    )
-                    if best_match:
-                        match_idx = drug_anno[drug_anno['clean_rawname'] == best_match[0]].index[0]
-                        harmonized = drug_anno.loc[match_idx, 'DrugName']
-                        result_data.append({
-                            'original_name': original_name,
-                            'cleaned_name': clean_name,
-                            'harmonized_name': harmonized,
-                            'match_type': 'fuzzy_rawname',
-                            'match_confidence': 'medium',
-                            'new_name': harmonized
-                        })
-                        matched = True
-        
-        # Try partial match (drug name is contained in annotation)
-        if not matched and len(clean_name) >= min_name_length:
-            # Check if drug name is contained in DrugName names
-            partial_drugname = drug_anno[drug_anno['clean_drugname'].str.contains(clean_name, na=False)]
-            if not partial_drugname.empty:
-                harmonized = partial_drugname.iloc[0]['DrugName']
-                result_data.append({
-                    'original_name': original_name,
-                    'cleaned_name': clean_name,
-                    'harmonized_name': harmonized,
-                    'match_type': 'partial_drugname',
-                    'match_confidence': 'low',
-                    'new_name': harmonized
-                })
-                matched = True
-            
-            # Check if drug name is contained in ProjectRawName names
-            elif not drug_anno[drug_anno['clean_rawname'].str.contains(clean_name, na=False)].empty:
-                partial_rawname = drug_anno[drug_anno['clean_rawname'].str.contains(clean_name, na=False)]
-                harmonized = partial_rawname.iloc[0]['DrugName']
-                result_data.append({
-                    'original_name': original_name,
-                    'cleaned_name': clean_name,
-                    'harmonized_name': harmonized,
-                    'match_type': 'partial_rawname',
-                    'match_confidence': 'low',
-                    'new_name': harmonized
-                })
-                matched = True
-        
-        # No match found - use cleaned name
-        if not matched:
-            result_data.append({
-                'original_name': original_name,
-                'cleaned_name': clean_name,
-                'harmonized_name': clean_name,
-                'match_type': 'no_match',
-                'match_confidence': 'none',
-                'new_name': original_name
-            })
-    
-    result_df = pd.DataFrame(result_data)
-    
-    # Print summary
-    match_summary = result_df['match_type'].value_counts()
-    logger.info("Drug name matching summary:")
-    for match_type, count in match_summary.items():
-        logger.info(f"    {match_type}: {count}")
-    
-    # Warn about low confidence matches
-    low_confidence = result_df[result_df['match_confidence'].isin(['medium', 'low'])]
-    if not low_confidence.empty:
-        logger.warning(f"{len(low_confidence)} drugs have medium/low confidence matches.")
-        logger.info("Consider manual review of these matches:")
-        for i in range(min(5, len(low_confidence))):
-            row = low_confidence.iloc[i]
-            logger.info(f"    {row['original_name']} -> {row['harmonized_name']} ({row['match_type']})")
-        if len(low_confidence) > 5:
-            logger.info(f"    ... and {len(low_confidence) - 5} more")
-    
-    return result_df
\ No newline at end of file
+    Examples:
+        >>> clear_harmonization_cache()
+    """
+    _ANNO_CACHE.clear()
+    _clean_name_impl.cache_clear()
+    _clean_drug_name_impl.cache_clear()
\ No newline at end of file
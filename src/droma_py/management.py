@@ -5,14 +5,17 @@ This module provides functions for managing DROMA database content,
 including updating tables, projects, and annotations.
 """
 
+import re
 import sqlite3
 import pandas as pd
 import numpy as np
-from typing import Optional, Union, List, Dict, Any
+from contextlib import contextmanager
+from typing import Optional, Union, List, Dict, Any, Iterator, Sequence, Set, Tuple
 from datetime import datetime
 import logging
 
 from .database import get_global_connection
+from .extract_sql import _BLOB_COLS_SUFFIX, _blob_side_tables
 from .exceptions import (
     DROMAConnectionError, 
     DROMADataError, 
@@ -22,6 +25,212 @@ from .exceptions import (
 
 logger = logging.getLogger(__name__)
 
+# Page cache size for write connections (negative values are KiB, i.e. 64 MB);
+# also marks a connection as already tuned
+_WRITE_CACHE_SIZE = -64000
+
+# Per-connection settings for bulk writes: in-memory temp B-trees, a larger
+# page cache and memory-mapped reads (256 MB)
+_WRITE_PRAGMAS = (
+    "PRAGMA temp_store=MEMORY",
+    f"PRAGMA cache_size={_WRITE_CACHE_SIZE}",
+    "PRAGMA mmap_size=268435456",
+)
+
+
+# Multi-row INSERTs were only measured faster for frames of up to this many
+# columns, and with statements of up to this many bound parameters
+_MULTI_ROW_MAX_COLUMNS = 50
+_MULTI_ROW_MAX_VARIABLES = 32766
+
+# SQL column types of the numpy dtype kinds written by the array fast path
+# (the types pandas' to_sql would give them)
+_ARRAY_SQL_TYPES = {'b': 'INTEGER', 'i': 'INTEGER', 'u': 'INTEGER', 'f': 'REAL'}
+
+# Number of array rows converted to Python values per executemany() call
+_ARRAY_CHUNK_ROWS = 10000
+
+# Columns filled in by update_droma_annotation, in insert order
+_SAMPLE_ANNO_COLUMNS = (
+    'SampleID', 'PatientID', 'ProjectID', 'HarmonizedIdentifier', 'TumorType',
+    'MolecularSubtype', 'Gender', 'Age', 'FullEthnicity', 'SimpleEthnicity',
+    'TNMstage', 'Primary_Metastasis', 'DataType', 'ProjectRawName',
+    'AlternateName', 'IndexID'
+)
+_DRUG_ANNO_COLUMNS = (
+    'DrugName', 'ProjectID', 'Harmonized ID (Pubchem ID)',
+    'Source for Clinical Information', 'Clinical Phase', 'MOA', 'Targets',
+    'ProjectRawName', 'IndexID'
+)
+_SAMPLE_ANNO_INSERT = (
+    f"INSERT INTO sample_anno ({', '.join(f'`{c}`' for c in _SAMPLE_ANNO_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(_SAMPLE_ANNO_COLUMNS))})"
+)
+_DRUG_ANNO_INSERT = (
+    f"INSERT INTO drug_anno ({', '.join(f'`{c}`' for c in _DRUG_ANNO_COLUMNS)}) "
+    f"VALUES ({', '.join('?' * len(_DRUG_ANNO_COLUMNS))})"
+)
+
+# Table names of the most recently listed connection, with the schema version
+# they were read at; a single entry, so at most one connection is kept alive
+_table_list_cache: Optional[Tuple[sqlite3.Connection, int, Tuple[str, ...]]] = None
+
+# Maximum number of tables combined into one UNION ALL row-count query
+# (stays below SQLite's default SQLITE_MAX_COMPOUND_SELECT of 500)
+_MAX_UNION_TABLES = 200
+
+
+def _tune_connection(connection: sqlite3.Connection) -> None:
+    """
+    Configure a connection for the write-heavy management functions.
+    
+    Switches the database to WAL journaling with synchronous=NORMAL, which
+    syncs the WAL at checkpoints instead of on every commit, and applies
+    _WRITE_PRAGMAS. Connections that are already tuned, or that are inside a
+    transaction (where the journal mode cannot change), are left as they are.
+    Failures (e.g. a read-only database) are logged and otherwise ignored.
+    
+    Args:
+        connection: Database connection
+    """
+    if connection.in_transaction:
+        return
+    
+    try:
+        if connection.execute("PRAGMA cache_size").fetchone()[0] == _WRITE_CACHE_SIZE:
+            return
+        
+        journal_mode = connection.execute("PRAGMA journal_mode=WAL").fetchone()[0]
+        # NORMAL is only crash-safe with a WAL journal
+        if str(journal_mode).lower() == "wal":
+            connection.execute("PRAGMA synchronous=NORMAL")
+        for pragma in _WRITE_PRAGMAS:
+            connection.execute(pragma)
+    except sqlite3.Error as e:
+        logger.debug(f"Could not tune database connection: {e}")
+
+
+def _list_tables(connection: sqlite3.Connection) -> Tuple[str, ...]:
+    """
+    List the tables of the database, excluding SQLite's internal tables.
+    
+    The list of the most recently used connection is cached and reused while
+    the database's schema version (bumped by every CREATE/DROP/ALTER) is
+    unchanged, so back-to-back calls skip the sqlite_master scan.
+    
+    Args:
+        connection: Database connection
+        
+    Returns:
+        Tuple[str, ...]: Table names, in sqlite_master order
+    """
+    global _table_list_cache
+    
+    schema_version = connection.execute("PRAGMA schema_version").fetchone()[0]
+    cached = _table_list_cache
+    if cached is not None and cached[0] is connection and cached[1] == schema_version:
+        return cached[2]
+    
+    tables = tuple(
+        row[0] for row in connection.execute(
+            "SELECT name FROM sqlite_master WHERE type='table' AND name NOT GLOB 'sqlite_*'"
+        )
+    )
+    _table_list_cache = (connection, schema_version, tables)
+    return tables
+
+
+def _project_tables(connection: sqlite3.Connection, project: Optional[str] = None) -> List[str]:
+    """
+    List the tables named like "project_datatype", excluding "_raw" backups.
+    
+    Args:
+        connection: Database connection
+        project: Only list the tables of this project (optional)
+        
+    Returns:
+        List[str]: Table names, in sqlite_master order
+    """
+    query = """
+        SELECT name FROM sqlite_master
+        WHERE type='table' AND name NOT GLOB 'sqlite_*'
+          AND name GLOB '*_*' AND name NOT GLOB '*_raw'
+    """
+    params: tuple = ()
+    if project is not None:
+        # Plain prefix comparison, so the project name needs no escaping
+        query += " AND substr(name, 1, ?) = ?"
+        params = (len(project) + 1, f"{project}_")
+    
+    return [row[0] for row in connection.execute(query, params)]
+
+
+def _max_sql_variables(connection: sqlite3.Connection) -> int:
+    """
+    Maximum number of bound parameters in one statement on a connection.
+    
+    Read from the connection's SQLITE_LIMIT_VARIABLE_NUMBER where Python
+    exposes it (3.11+); otherwise the 999 that older SQLite builds allow.
+    """
+    limit_category = getattr(sqlite3, 'SQLITE_LIMIT_VARIABLE_NUMBER', None)
+    if limit_category is not None and hasattr(connection, 'getlimit'):
+        return int(connection.getlimit(limit_category))
+    return 999
+
+
+def _write_array(connection: sqlite3.Connection, table_name: str, array: np.ndarray) -> None:
+    """
+    Write a 2-D numeric array to a new table without going through pandas.
+    
+    Replaces any existing table with one column per array column, named
+    "0", "1", ... and typed after the array's dtype, exactly as
+    DataFrame.to_sql would for pd.DataFrame(array). Rows are converted to
+    Python values one chunk at a time and inserted with executemany().
+    
+    Args:
+        connection: Database connection
+        table_name: Name of the table to write
+        array: 2-D array with a dtype kind in _ARRAY_SQL_TYPES
+    """
+    quoted_table = '"' + table_name.replace('"', '""') + '"'
+    sql_type = _ARRAY_SQL_TYPES[array.dtype.kind]
+    column_defs = ", ".join(f'"{i}" {sql_type}' for i in range(array.shape[1]))
+    insert_query = f"INSERT INTO {quoted_table} VALUES ({', '.join('?' * array.shape[1])})"
+    
+    with _write_transaction(connection):
+        connection.execute(f"DROP TABLE IF EXISTS {quoted_table}")
+        connection.execute(f"CREATE TABLE {quoted_table} ({column_defs})")
+        for start in range(0, array.shape[0], _ARRAY_CHUNK_ROWS):
+            connection.executemany(insert_query, array[start:start + _ARRAY_CHUNK_ROWS].tolist())
+
+
+@contextmanager
+def _write_transaction(connection: sqlite3.Connection) -> Iterator[None]:
+    """
+    Run a block of reads and writes as one BEGIN IMMEDIATE transaction.
+    
+    The write lock is taken up front, so the data read in the block cannot
+    change before the block's writes are committed, and the writes are
+    committed together. The transaction is rolled back if the block raises.
+    If the connection is already inside a transaction, the block joins it
+    and commits it at the end.
+    
+    Args:
+        connection: Database connection
+    """
+    if connection.in_transaction:
+        yield
+        connection.commit()
+        return
+    
+    connection.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+    except BaseException:
+        connection.rollback()
+        raise
+    connection.commit()
+
 
 def update_droma_database(
     obj: Union[pd.DataFrame, np.ndarray],
@@ -58,6 +267,7 @@ def update_droma_database(
     """
     if connection is None:
         connection = get_global_connection()
+    _tune_connection(connection)
     
     # Check if table already exists
     cursor = connection.cursor()
@@ -72,8 +282,14 @@ def update_droma_database(
     elif table_exists and overwrite:
         logger.info(f"Overwriting existing table '{table_name}'")
     
-    # Process the object based on its type
-    if isinstance(obj, np.ndarray):
+    # Process the object based on its type; plain 2-D numeric arrays are
+    # written directly (they get no feature_id column, having no index)
+    df = None
+    if (isinstance(obj, np.ndarray) and obj.ndim == 2 and obj.shape[1] > 0 and
+            obj.dtype.kind in _ARRAY_SQL_TYPES and not hasattr(obj, 'index') and
+            not hasattr(obj, 'columns')):
+        n_rows, columns = obj.shape[0], [str(i) for i in range(obj.shape[1])]
+    elif isinstance(obj, np.ndarray):
         # Convert numpy array to DataFrame
         df = pd.DataFrame(obj)
         if hasattr(obj, 'index'):
@@ -81,35 +297,64 @@ def update_droma_database(
         if hasattr(obj, 'columns'):
             df.columns = obj.columns
     elif isinstance(obj, pd.DataFrame):
-        df = obj.copy()
+        # Not copied: reset_index() below returns a new frame, and to_sql
+        # leaves the frame untouched
+        df = obj
     else:
         raise DROMADataError(
             "Object must be a pandas DataFrame or numpy array",
             f"Got {type(obj)}"
         )
     
-    # Add feature_id column if index has meaningful names
-    if df.index.name or not all(df.index == range(len(df))):
-        df = df.reset_index()
-        df.rename(columns={df.columns[0]: 'feature_id'}, inplace=True)
+    if df is not None:
+        # Add feature_id column if index has meaningful names; a RangeIndex is
+        # checked from its bounds, other indexes against 0..n-1
+        if isinstance(df.index, pd.RangeIndex):
+            default_index = df.index.start == 0 and df.index.step == 1
+        else:
+            default_index = bool(np.all(df.index == np.arange(len(df))))
+        if df.index.name or not default_index:
+            # The old index is the first column; rename it by rebuilding
+            # the column labels rather than through rename()
+            df = df.reset_index()
+            df.columns = pd.Index(['feature_id', *df.columns[1:]])
+        n_rows, columns = len(df), list(df.columns)
     
     try:
-        # Write to database
-        df.to_sql(table_name, connection, if_exists='replace', index=False)
+        if df is None:
+            _write_array(connection, table_name, obj)
+        else:
+            # Write to database; narrow frames are written several rows per
+            # INSERT statement, as many as the parameter limit allows
+            insert_options = {}
+            if len(columns) <= _MULTI_ROW_MAX_COLUMNS:
+                max_variables = min(_max_sql_variables(connection), _MULTI_ROW_MAX_VARIABLES)
+                insert_options = {
+                    'method': 'multi',
+                    'chunksize': max(1, max_variables // max(1, len(columns)))
+                }
+            df.to_sql(table_name, connection, if_exists='replace', index=False, **insert_options)
         
         # Create index on feature_id for faster lookups if column exists
-        if 'feature_id' in df.columns:
+        if 'feature_id' in columns:
             index_name = f"idx_{table_name}_feature_id"
             try:
                 cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {table_name} (feature_id)")
             except sqlite3.Error as e:
                 logger.warning(f"Could not create index: {e}")
         
+        # Dimensions recorded by store_matrices_in_database describe the
+        # replaced table, not this one
+        if 'matrix_metadata' in _list_tables(connection):
+            cursor.execute("DELETE FROM matrix_metadata WHERE table_name = ?", (table_name,))
+        
         connection.commit()
+        # Let SQLite refresh planner statistics that the writes made stale
+        connection.execute("PRAGMA optimize")
         
         logger.info(
             f"Added {'DataFrame' if isinstance(obj, pd.DataFrame) else 'array'} "
-            f"to database as '{table_name}' with {len(df)} rows and {len(df.columns)} columns"
+            f"to database as '{table_name}' with {n_rows} rows and {len(columns)} columns"
         )
         
         return True
@@ -126,7 +371,7 @@ def list_droma_database_tables(
     List available tables in DROMA database.
     
     Provides information about omics and drug tables in the DROMA database.
-    Excludes annotation tables, projects table, and backup tables.
+    Excludes annotation tables, projects table, matrix metadata, and backup tables.
     
     Args:
         pattern: Optional regex pattern to filter table names
@@ -142,44 +387,108 @@ def list_droma_database_tables(
     if connection is None:
         connection = get_global_connection()
     
-    # Get table list
+    # Get the omics and drug tables: names following the pattern
+    # "project_datatype", excluding system tables and tables containing
+    # "raw", "dose", or "viability" (GLOB is case-sensitive, like `in`)
     cursor = connection.cursor()
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-    all_tables = [row[0] for row in cursor.fetchall()]
-    
-    # Filter to only omics and drug tables, excluding system tables and backups
-    excluded_tables = {'sample_anno', 'drug_anno', 'projects', 'droma_metadata', 'search_vectors'}
-    tables = [t for t in all_tables if t not in excluded_tables]
+    cursor.execute(
+        """
+        SELECT name FROM sqlite_master
+        WHERE type='table' AND name NOT GLOB 'sqlite_*'
+          AND name NOT IN ('sample_anno', 'drug_anno', 'projects', 'droma_metadata', 'search_vectors',
+                           'matrix_metadata')
+          AND name NOT GLOB '*raw*' AND name NOT GLOB '*dose*' AND name NOT GLOB '*viability*'
+          AND name GLOB '*_*'
+        """
+    )
+    tables = [row[0] for row in cursor.fetchall()]
     
-    # Remove tables containing "raw", "dose", or "viability"
-    tables = [t for t in tables if not any(x in t for x in ['raw', 'dose', 'viability'])]
+    # Columns of all tables in a single pass over the schema
+    table_columns: Dict[str, List[Tuple[str, str]]] = {}
+    try:
+        cursor.execute(
+            """
+            SELECT m.name, p.name, upper(coalesce(p.type, ''))
+            FROM sqlite_master m JOIN pragma_table_info(m.name) p
+            WHERE m.type = 'table'
+            ORDER BY m.name, p.cid
+            """
+        )
+        for table_name, column_name, column_type in cursor.fetchall():
+            table_columns.setdefault(table_name, []).append((column_name, column_type))
+    except sqlite3.Error:
+        # Tables missing here are looked up one by one below
+        table_columns = {}
     
-    # Only keep tables that follow the pattern "project_datatype"
-    tables = [t for t in tables if '_' in t and len(t.split('_')) >= 2]
+    # BLOB layout tables written by store_matrices_in_database keep their
+    # sample names (and quantization parameters) in side tables, which are
+    # not listed; their samples are the rows of the "_cols" side table
+    blob_sample_tables: Dict[str, str] = {}
+    hidden_tables: Set[str] = set()
+    for table in tables:
+        side_tables = _blob_side_tables(table, table_columns)
+        hidden_tables.update(side_tables)
+        if f"{table}{_BLOB_COLS_SUFFIX}" in side_tables:
+            blob_sample_tables[table] = f"{table}{_BLOB_COLS_SUFFIX}"
+    tables = [t for t in tables if t not in hidden_tables]
     
     # Apply user pattern filter if provided
     if pattern:
-        import re
-        tables = [t for t in tables if re.search(pattern, t)]
+        regex = re.compile(pattern)
+        tables = [t for t in tables if regex.search(t)]
     
     if not tables:
         logger.info("No omics or drug tables found")
         return pd.DataFrame()
     
+    # Number of samples = columns other than feature_id
+    sample_counts = {
+        table: sum(name != 'feature_id' for name, _ in table_columns[table])
+        for table in tables if table in table_columns
+    }
+    for table, cols_table in blob_sample_tables.items():
+        if table in sample_counts:
+            cursor.execute(f"SELECT COUNT(*) FROM {cols_table}")
+            sample_counts[table] = cursor.fetchone()[0]
+    
+    # Row counts with one UNION ALL query per batch of tables
+    feature_counts = {}
+    for start in range(0, len(tables), _MAX_UNION_TABLES):
+        batch = tables[start:start + _MAX_UNION_TABLES]
+        count_query = " UNION ALL ".join(
+            f"SELECT ?, COUNT(*) FROM {table}" for table in batch
+        )
+        try:
+            cursor.execute(count_query, batch)
+            feature_counts.update({row[0]: row[1] for row in cursor.fetchall()})
+        except sqlite3.Error:
+            # Fall back to counting tables one by one so that a single
+            # unreadable table doesn't hide the others
+            for table in batch:
+                try:
+                    cursor.execute(f"SELECT COUNT(*) FROM {table}")
+                    feature_counts[table] = cursor.fetchone()[0]
+                except sqlite3.Error as e:
+                    logger.warning(f"Error getting info for table {table}: {e}")
+    
     # Get metadata for each table
     result_data = []
     
     for table in tables:
+        if table not in feature_counts:
+            continue
         try:
             # Get basic table info
-            cursor.execute(f"SELECT COUNT(*) FROM {table}")
-            feature_count = cursor.fetchone()[0]
+            feature_count = feature_counts[table]
             
-            cursor.execute(f"PRAGMA table_info({table})")
-            columns_info = cursor.fetchall()
-            column_names = [col[1] for col in columns_info]
-            feature_id_cols = sum(1 for name in column_names if name == 'feature_id')
-            sample_count = max(0, len(column_names) - feature_id_cols)
+            if table in sample_counts:
+                sample_count = sample_counts[table]
+            else:
+                cursor.execute(f"PRAGMA table_info({table})")
+                columns_info = cursor.fetchall()
+                column_names = [col[1] for col in columns_info]
+                feature_id_cols = sum(1 for name in column_names if name == 'feature_id')
+                sample_count = max(0, len(column_names) - feature_id_cols)
             
             # Extract data type and feature type
             parts = table.split('_')
@@ -213,7 +522,7 @@ def list_droma_database_tables(
     result_df = pd.DataFrame(result_data)
     
     # Add created_date and updated_date from projects table if available
-    if 'projects' in all_tables:
+    if 'projects' in _list_tables(connection):
         try:
             projects_df = pd.read_sql_query("SELECT * FROM projects", connection)
             for idx, row in result_df.iterrows():
@@ -275,16 +584,10 @@ def list_droma_projects(
         return projects_df
     
     # If no projects table, infer from table names
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-    all_tables = [row[0] for row in cursor.fetchall()]
-    
     project_names = set()
-    for table in all_tables:
-        parts = table.split('_')
-        if (len(parts) >= 2 and 
-            table not in ['sample_anno', 'drug_anno'] and 
-            not table.endswith('_raw')):
-            project_names.add(parts[0])
+    for table in _project_tables(connection):
+        if table not in ['sample_anno', 'drug_anno']:
+            project_names.add(table.split('_')[0])
     
     project_names = list(project_names)
     
@@ -299,10 +602,8 @@ def list_droma_projects(
     
     if project_data_types:
         if project_data_types in project_names:
-            # Get all tables for this project
-            project_tables = [t for t in all_tables if t.startswith(f"{project_data_types}_")]
-            # Remove backup tables
-            project_tables = [t for t in project_tables if not t.endswith('_raw')]
+            # Get all tables for this project, without backup tables
+            project_tables = _project_tables(connection, project_data_types)
             # Extract data types
             data_types = list(set(t.replace(f"{project_data_types}_", "") for t in project_tables))
             return data_types
@@ -345,160 +646,163 @@ def update_droma_projects(
     """
     if connection is None:
         connection = get_global_connection()
+    _tune_connection(connection)
     
     cursor = connection.cursor()
     
-    # Get all tables in the database
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-    all_tables = [row[0] for row in cursor.fetchall()]
-    
-    # Extract project names from table names
-    if project_name is None:
-        project_names = set()
-        for table in all_tables:
-            parts = table.split('_')
-            if (len(parts) >= 2 and 
-                table not in ['sample_anno', 'drug_anno', 'search_vectors', 'projects', 'droma_metadata'] and
-                not table.endswith('_raw')):
-                project_names.add(parts[0])
-        project_names = list(project_names)
-    else:
-        project_names = [project_name]
-    
-    if not project_names:
-        logger.info("No projects found in database")
-        return False
-    
-    # Check if projects table exists, create if needed
-    projects_table_exists = 'projects' in all_tables
-    if not projects_table_exists:
-        if create_table:
-            create_projects_query = """
-                CREATE TABLE projects (
-                    project_name TEXT PRIMARY KEY,
-                    dataset_type TEXT,
-                    data_types TEXT,
-                    sample_count INTEGER,
-                    drug_count INTEGER,
-                    created_date TEXT,
-                    updated_date TEXT
-                )
-            """
-            cursor.execute(create_projects_query)
-            logger.info("Created projects table")
+    # Hold the write lock from reading the current tables and projects
+    # until the updated projects are committed
+    with _write_transaction(connection):
+        # Get all tables in the database, and the candidate project tables
+        table_set = set(_list_tables(connection))
+        candidate_tables = _project_tables(connection, project_name)
+        
+        # Extract project names from table names
+        if project_name is None:
+            project_names = set()
+            for table in candidate_tables:
+                if table not in ['sample_anno', 'drug_anno', 'search_vectors', 'projects', 'droma_metadata']:
+                    project_names.add(table.split('_')[0])
+            project_names = list(project_names)
         else:
-            raise DROMATableError(
-                "Projects table does not exist",
-                "Set create_table=True to create it"
-            )
-    
-    # Get existing projects data
-    existing_projects = pd.read_sql_query("SELECT * FROM projects", connection) if projects_table_exists else pd.DataFrame()
-    
-    updated_count = 0
-    added_count = 0
-    current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    
-    for proj in project_names:
-        # Get tables for this project
-        project_tables = [t for t in all_tables if t.startswith(f"{proj}_")]
-        project_tables = [t for t in project_tables if not t.endswith('_raw')]
+            project_names = [project_name]
         
-        if not project_tables:
-            logger.warning(f"No tables found for project '{proj}'")
-            continue
+        if not project_names:
+            logger.info("No projects found in database")
+            return False
         
-        # Extract data types, excluding tables with "raw", "dose", or "viability"
-        filtered_tables = [t for t in project_tables if not any(x in t for x in ['raw', 'dose', 'viability'])]
-        data_types = set()
-        for table in filtered_tables:
-            data_type = table.replace(f"{proj}_", "")
-            data_types.add(data_type)
+        # Check if projects table exists, create if needed
+        projects_table_exists = 'projects' in table_set
+        if not projects_table_exists:
+            if create_table:
+                create_projects_query = """
+                    CREATE TABLE projects (
+                        project_name TEXT PRIMARY KEY,
+                        dataset_type TEXT,
+                        data_types TEXT,
+                        sample_count INTEGER,
+                        drug_count INTEGER,
+                        created_date TEXT,
+                        updated_date TEXT
+                    )
+                """
+                cursor.execute(create_projects_query)
+                logger.info("Created projects table")
+            else:
+                raise DROMATableError(
+                    "Projects table does not exist",
+                    "Set create_table=True to create it"
+                )
         
-        # Special handling for drug_dose and drug_viability tables
-        if any(t in project_tables for t in [f"{proj}_drug_dose", f"{proj}_drug_viability"]):
-            data_types.add("drug_dose")
+        # Get existing projects data
+        existing_projects = pd.read_sql_query("SELECT * FROM projects", connection) if projects_table_exists else pd.DataFrame()
         
-        data_types = sorted(data_types)
+        # Sample count and first listed data type of every project, in one pass
+        # over sample_anno (with a single min(), SQLite takes the bare DataType
+        # from the row holding the minimum, i.e. the project's first row);
+        # the fallbacks cover WITHOUT ROWID tables and a missing DataType
+        project_samples = {}
+        if 'sample_anno' in table_set:
+            for sample_query in (
+                "SELECT ProjectID, COUNT(DISTINCT SampleID), DataType, MIN(rowid) FROM sample_anno GROUP BY ProjectID",
+                "SELECT ProjectID, COUNT(DISTINCT SampleID), "
+                "(SELECT DataType FROM sample_anno t WHERE t.ProjectID = s.ProjectID LIMIT 1) "
+                "FROM sample_anno s GROUP BY ProjectID",
+                "SELECT ProjectID, COUNT(DISTINCT SampleID), NULL FROM sample_anno GROUP BY ProjectID"
+            ):
+                try:
+                    cursor.execute(sample_query)
+                    project_samples = {row[0]: (row[1], row[2]) for row in cursor.fetchall()}
+                    break
+                except sqlite3.Error:
+                    pass
         
-        # Determine dataset type
-        current_dataset_type = dataset_type
-        sample_count = 0
+        updated_count = 0
+        added_count = 0
+        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         
-        # Get sample count from sample_anno if available
-        if 'sample_anno' in all_tables:
-            try:
-                sample_query = "SELECT COUNT(DISTINCT SampleID) FROM sample_anno WHERE ProjectID = ?"
-                cursor.execute(sample_query, (proj,))
-                result = cursor.fetchone()
-                sample_count = result[0] if result else 0
-                
-                # Try to guess dataset_type if not provided
-                if current_dataset_type is None:
-                    type_query = "SELECT DISTINCT DataType FROM sample_anno WHERE ProjectID = ? LIMIT 1"
-                    cursor.execute(type_query, (proj,))
-                    type_result = cursor.fetchone()
-                    if type_result:
-                        current_dataset_type = type_result[0]
-            except sqlite3.Error:
-                pass
-        
-        # Count drugs in drug table if available
-        drug_count = 0
-        drug_table = f"{proj}_drug"
-        if drug_table in all_tables:
-            try:
-                cursor.execute(f"SELECT COUNT(*) FROM {drug_table}")
-                result = cursor.fetchone()
-                drug_count = result[0] if result else 0
-            except sqlite3.Error:
-                pass
-        
-        data_types_str = ','.join(data_types)
-        
-        # Check if project already exists
-        project_exists = not existing_projects.empty and proj in existing_projects['project_name'].values
-        
-        if project_exists:
-            # Update existing project
-            update_query = """
-                UPDATE projects SET
-                    dataset_type = ?,
-                    data_types = ?,
-                    sample_count = ?,
-                    drug_count = ?,
-                    updated_date = ?
-                WHERE project_name = ?
-            """
-            cursor.execute(update_query, (
-                current_dataset_type, data_types_str, sample_count, 
-                drug_count, current_time, proj
-            ))
+        for proj in project_names:
+            # Get tables for this project
+            project_tables = [t for t in candidate_tables if t.startswith(f"{proj}_")]
             
-            logger.info(
-                f"Updated project '{proj}' with {len(data_types)} data types "
-                f"({data_types_str}), {sample_count} samples, {drug_count} drugs"
-            )
-            updated_count += 1
-        else:
-            # Add new project
-            insert_query = """
-                INSERT INTO projects (project_name, dataset_type, data_types, 
-                                    sample_count, drug_count, created_date, updated_date)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            """
-            cursor.execute(insert_query, (
-                proj, current_dataset_type, data_types_str, sample_count,
-                drug_count, current_time, current_time
-            ))
+            if not project_tables:
+                logger.warning(f"No tables found for project '{proj}'")
+                continue
             
-            logger.info(
-                f"Added new project '{proj}' with {len(data_types)} data types "
-                f"({data_types_str}), {sample_count} samples, {drug_count} drugs"
-            )
-            added_count += 1
-    
-    connection.commit()
+            # Extract data types, excluding tables with "raw", "dose", or "viability"
+            filtered_tables = [t for t in project_tables if not any(x in t for x in ['raw', 'dose', 'viability'])]
+            data_types = set()
+            for table in filtered_tables:
+                data_type = table.replace(f"{proj}_", "")
+                data_types.add(data_type)
+            
+            # Special handling for drug_dose and drug_viability tables
+            if any(t in project_tables for t in [f"{proj}_drug_dose", f"{proj}_drug_viability"]):
+                data_types.add("drug_dose")
+            
+            data_types = sorted(data_types)
+            
+            # Get sample count from sample_anno if available, and guess
+            # dataset_type from it if not provided
+            sample_count, anno_dataset_type = project_samples.get(proj, (0, None))
+            current_dataset_type = dataset_type if dataset_type is not None else anno_dataset_type
+            
+            # Count drugs in drug table if available
+            drug_count = 0
+            drug_table = f"{proj}_drug"
+            if drug_table in table_set:
+                try:
+                    cursor.execute(f"SELECT COUNT(*) FROM {drug_table}")
+                    result = cursor.fetchone()
+                    drug_count = result[0] if result else 0
+                except sqlite3.Error:
+                    pass
+            
+            data_types_str = ','.join(data_types)
+            
+            # Check if project already exists
+            project_exists = not existing_projects.empty and proj in existing_projects['project_name'].values
+            
+            if project_exists:
+                # Update existing project
+                update_query = """
+                    UPDATE projects SET
+                        dataset_type = ?,
+                        data_types = ?,
+                        sample_count = ?,
+                        drug_count = ?,
+                        updated_date = ?
+                    WHERE project_name = ?
+                """
+                cursor.execute(update_query, (
+                    current_dataset_type, data_types_str, sample_count, 
+                    drug_count, current_time, proj
+                ))
+                
+                logger.info(
+                    f"Updated project '{proj}' with {len(data_types)} data types "
+                    f"({data_types_str}), {sample_count} samples, {drug_count} drugs"
+                )
+                updated_count += 1
+            else:
+                # Add new project
+                insert_query = """
+                    INSERT INTO projects (project_name, dataset_type, data_types, 
+                                        sample_count, drug_count, created_date, updated_date)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                """
+                cursor.execute(insert_query, (
+                    proj, current_dataset_type, data_types_str, sample_count,
+                    drug_count, current_time, current_time
+                ))
+                
+                logger.info(
+                    f"Added new project '{proj}' with {len(data_types)} data types "
+                    f"({data_types_str}), {sample_count} samples, {drug_count} drugs"
+                )
+                added_count += 1
+    # Let SQLite refresh planner statistics that the writes made stale
+    connection.execute("PRAGMA optimize")
     
     if added_count > 0 or updated_count > 0:
         logger.info(f"Project metadata update complete: {added_count} projects added, {updated_count} projects updated")
@@ -508,6 +812,44 @@ def update_droma_projects(
     return True
 
 
+def _insert_annotation_rows(
+    connection: sqlite3.Connection,
+    insert_query: str,
+    rows: Sequence[Sequence[Any]]
+) -> int:
+    """
+    Insert annotation rows with a single executemany call.
+    
+    If the batch fails, it is rolled back and the rows are inserted one at a
+    time instead, logging and skipping the rows that fail.
+    
+    Args:
+        connection: Database connection
+        insert_query: Parameterized INSERT statement
+        rows: Parameter rows, each starting with the entry's name
+        
+    Returns:
+        int: Number of rows inserted
+    """
+    cursor = connection.cursor()
+    cursor.execute("SAVEPOINT droma_annotation_insert")
+    try:
+        cursor.executemany(insert_query, rows)
+        return len(rows)
+    except sqlite3.Error:
+        cursor.execute("ROLLBACK TO droma_annotation_insert")
+        added_count = 0
+        for row in rows:
+            try:
+                cursor.execute(insert_query, row)
+                added_count += 1
+            except sqlite3.Error as e:
+                logger.error(f"Failed to insert entry for {row[0]}: {e}")
+        return added_count
+    finally:
+        cursor.execute("RELEASE droma_annotation_insert")
+
+
 def update_droma_annotation(
     anno_type: str,
     name_mapping: pd.DataFrame,
@@ -550,6 +892,7 @@ def update_droma_annotation(
     """
     if connection is None:
         connection = get_global_connection()
+    _tune_connection(connection)
     
     # Validate anno_type
     if anno_type not in ['sample', 'drug']:
@@ -585,115 +928,116 @@ def update_droma_annotation(
         table_name = 'sample_anno'
         id_column = 'SampleID'
         index_prefix = 'UM_SAMPLE_'
+        insert_query = _SAMPLE_ANNO_INSERT
     else:
         table_name = 'drug_anno'
         id_column = 'DrugName'
         index_prefix = 'UM_DRUG_'
+        insert_query = _DRUG_ANNO_INSERT
     
     cursor = connection.cursor()
     
-    # Check if table exists
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
-    if not cursor.fetchone():
-        raise DROMATableError(f"Annotation table '{table_name}' not found in database")
-    
-    # Get existing annotation data
-    existing_anno = pd.read_sql_query(f"SELECT * FROM {table_name}", connection)
-    
-    # Find maximum IndexID number for generating new IDs
-    max_index_num = 0
-    if 'IndexID' in existing_anno.columns and not existing_anno.empty:
-        index_ids = existing_anno['IndexID'].dropna()
-        if not index_ids.empty:
-            numbers = index_ids.str.replace(index_prefix, '').astype(str)
-            numeric_ids = pd.to_numeric(numbers, errors='coerce').dropna()
-            if not numeric_ids.empty:
-                max_index_num = int(numeric_ids.max())
-    
-    added_count = 0
-    skipped_count = 0
-    current_index_num = max_index_num
-    
-    # Helper function to get parameter value for row i
-    def _get_param_value(param, i):
-        if param is None:
-            return None
-        if isinstance(param, list):
-            return param[i] if len(param) > 1 else param[0]
-        return param
-    
-    # Process each entry
-    for i, row in name_mapping.iterrows():
-        new_name = row['new_name']
-        original_name = row['original_name']
-        match_confidence = row['match_confidence']
-        
-        # Check if entry already exists
-        if anno_type == 'sample':
-            existing_check = existing_anno[
-                (existing_anno['SampleID'] == new_name) & 
-                (existing_anno['ProjectID'] == project_name)
-            ]
-        else:
-            existing_check = existing_anno[
-                (existing_anno['DrugName'] == new_name) & 
-                (existing_anno['ProjectID'] == project_name)
-            ]
+    # Hold the write lock from reading the existing entries (and their
+    # IndexIDs) until the new ones are committed
+    with _write_transaction(connection):
+        # Check if table exists
+        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table_name,))
+        if not cursor.fetchone():
+            raise DROMATableError(f"Annotation table '{table_name}' not found in database")
         
-        if not existing_check.empty:
-            skipped_count += 1
-            continue
+        # Index the (project, name) pairs, so that the names already added to
+        # a project are read from the index instead of scanning the table
+        try:
+            cursor.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{table_name}_lookup ON {table_name} (ProjectID, {id_column})"
+            )
+        except sqlite3.Error as e:
+            logger.warning(f"Could not create index: {e}")
+        
+        # Names already in the table for this project; missing values never match
+        cursor.execute(
+            f"SELECT {id_column} FROM {table_name} WHERE ProjectID = ? AND {id_column} IS NOT NULL",
+            (project_name,)
+        )
+        existing_names = {row[0] for row in cursor.fetchall()}
+        
+        # Find maximum IndexID number for generating new IDs, reading only the
+        # text IndexIDs rather than the whole table
+        max_index_num = 0
+        cursor.execute(f"SELECT 1 FROM pragma_table_info('{table_name}') WHERE name = 'IndexID'")
+        if cursor.fetchone():
+            cursor.execute(f"SELECT IndexID FROM {table_name} WHERE typeof(IndexID) = 'text'")
+            # Single pass over the IDs; anything that isn't the prefix followed
+            # by digits is ignored
+            numbers = (index_id.replace(index_prefix, '') for (index_id,) in cursor)
+            max_index_num = max(
+                (int(number) for number in numbers if number.isascii() and number.isdigit()),
+                default=0
+            )
+        
+        added_count = 0
+        skipped_count = 0
+        current_index_num = max_index_num
+        
+        # Find the entries to add and give them new IndexIDs
+        new_entries = []
+        for i, new_name, original_name in zip(
+            name_mapping.index.tolist(),
+            name_mapping['new_name'].tolist(),
+            name_mapping['original_name'].tolist()
+        ):
+            # Check if entry already exists
+            if new_name in existing_names:
+                skipped_count += 1
+                continue
+            
+            # Generate new IndexID
+            current_index_num += 1
+            new_entries.append((i, new_name, original_name, f"{index_prefix}{current_index_num}"))
+        
+        # Resolve each sample parameter once into its values for the new
+        # entries: lists with several values are indexed by the entries' row
+        # labels, anything else applies to every entry
+        labels = [entry[0] for entry in new_entries]
         
-        # Generate new IndexID
-        current_index_num += 1
-        new_index_id = f"{index_prefix}{current_index_num}"
+        def _param_values(param: Any) -> List[Any]:
+            if isinstance(param, list):
+                if len(param) > 1:
+                    return [param[i] for i in labels]
+                return [param[0]] * len(labels) if labels else []
+            return [param] * len(labels)
         
-        # Prepare insert data
         if anno_type == 'sample':
-            insert_data = {
-                'SampleID': new_name,
-                'PatientID': _get_param_value(patient_id, i),
-                'ProjectID': project_name,
-                'HarmonizedIdentifier': None,
-                'TumorType': _get_param_value(tumor_type, i),
-                'MolecularSubtype': None,
-                'Gender': _get_param_value(gender, i),
-                'Age': _get_param_value(age, i),
-                'FullEthnicity': _get_param_value(full_ethnicity, i),
-                'SimpleEthnicity': _get_param_value(simple_ethnicity, i),
-                'TNMstage': None,
-                'Primary_Metastasis': None,
-                'DataType': _get_param_value(data_type, i),
-                'ProjectRawName': original_name,
-                'AlternateName': None,
-                'IndexID': new_index_id
-            }
+            patient_ids = _param_values(patient_id)
+            tumor_types = _param_values(tumor_type)
+            genders = _param_values(gender)
+            ages = _param_values(age)
+            full_ethnicities = _param_values(full_ethnicity)
+            simple_ethnicities = _param_values(simple_ethnicity)
+            data_types = _param_values(data_type)
+            
+            # Rows in _SAMPLE_ANNO_COLUMNS order
+            insert_rows: List[Tuple[Any, ...]] = [
+                (new_name, patient_ids[j], project_name, None, tumor_types[j],
+                 None, genders[j], ages[j], full_ethnicities[j], simple_ethnicities[j],
+                 None, None, data_types[j], original_name,
+                 None, new_index_id)
+                for j, (_, new_name, original_name, new_index_id) in enumerate(new_entries)
+            ]
         else:
-            insert_data = {
-                'DrugName': new_name,
-                'ProjectID': project_name,
-                'Harmonized ID (Pubchem ID)': None,
-                'Source for Clinical Information': None,
-                'Clinical Phase': None,
-                'MOA': None,
-                'Targets': None,
-                'ProjectRawName': original_name,
-                'IndexID': new_index_id
-            }
-        
-        # Insert new entry
-        columns = ', '.join(f'`{k}`' for k in insert_data.keys())
-        placeholders = ', '.join('?' * len(insert_data))
-        insert_query = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
+            # Rows in _DRUG_ANNO_COLUMNS order
+            insert_rows = [
+                (new_name, project_name, None,
+                 None, None, None, None,
+                 original_name, new_index_id)
+                for _, new_name, original_name, new_index_id in new_entries
+            ]
         
-        try:
-            cursor.execute(insert_query, list(insert_data.values()))
-            added_count += 1
-        except sqlite3.Error as e:
-            logger.error(f"Failed to insert entry for {new_name}: {e}")
-            continue
-    
-    connection.commit()
+        # Insert new entries in one batch
+        if insert_rows:
+            added_count = _insert_annotation_rows(connection, insert_query, insert_rows)
+    # Let SQLite refresh planner statistics that the writes made stale
+    connection.execute("PRAGMA optimize")
     
     # Print summary
     logger.info(f"Updated {table_name} table:")
@@ -0,0 +1,194 @@
+"""Tests for matrix storage and retrieval in droma_py.extract_sql."""
+
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from droma_py import extract_sql
+from droma_py.extract_sql import (
+    list_matrix_tables,
+    retrieve_matrix_from_database,
+    store_matrices_in_database,
+)
+from droma_py.management import list_droma_database_tables
+
+
+@pytest.fixture
+def matrix() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        rng.random((50, 4)),
+        index=[f"Gene_{i}" for i in range(50)],
+        columns=[f"Sample_{i}" for i in range(4)],
+    )
+
+
+@pytest.mark.parametrize("layout", ["columns", "blob"])
+def test_store_and_retrieve_round_trip(tmp_path, matrix, layout):
+    db_path = tmp_path / "matrices.sqlite"
+    store_matrices_in_database(db_path, matrix, "expr", layout=layout)
+
+    result = retrieve_matrix_from_database(db_path, "expr")
+
+    assert result.index.tolist() == matrix.index.tolist()
+    assert result.columns.tolist() == matrix.columns.tolist()
+    np.testing.assert_allclose(result.to_numpy(), matrix.to_numpy(), rtol=1e-6)
+
+
+@pytest.mark.parametrize("layout", ["columns", "blob"])
+def test_retrieve_features_subset(tmp_path, matrix, layout):
+    db_path = tmp_path / "matrices.sqlite"
+    store_matrices_in_database(db_path, matrix, "expr", layout=layout)
+
+    result = retrieve_matrix_from_database(
+        db_path, "expr", features=["Gene_7", "Gene_3", "missing"]
+    )
+
+    assert result.index.tolist() == ["Gene_3", "Gene_7"]
+    np.testing.assert_allclose(
+        result.to_numpy(), matrix.loc[["Gene_3", "Gene_7"]].to_numpy(), rtol=1e-6
+    )
+
+
+def test_list_matrix_tables(tmp_path, matrix):
+    db_path = tmp_path / "matrices.sqlite"
+    store_matrices_in_database(db_path, matrix, "expr")
+    store_matrices_in_database(db_path, matrix, "meth", layout="blob")
+
+    tables = list_matrix_tables(db_path).set_index("table_name")
+
+    assert sorted(tables.index) == ["expr", "meth"]
+    assert tables.loc["expr", "n_features"] == 50
+    assert tables.loc["meth", "n_samples"] == 4
+
+
+def test_read_connections_are_per_thread(tmp_path, matrix):
+    db_path = tmp_path / "matrices.sqlite"
+    store_matrices_in_database(db_path, matrix, "expr")
+
+    main_conn = extract_sql._get_conn(db_path)
+    assert extract_sql._get_conn(db_path) is main_conn
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(extract_sql._get_conn(db_path)))
+    thread.start()
+    thread.join()
+    assert other[0] is not main_conn
+
+
+def test_store_does_not_cache_write_connection(tmp_path, matrix):
+    db_path = tmp_path / "matrices.sqlite"
+    store_matrices_in_database(db_path, matrix, "expr")
+
+    assert not any(key.endswith("|rw") for key in extract_sql._thread_pool())
+
+
+def test_concurrent_stores(tmp_path, matrix):
+    db_path = tmp_path / "matrices.sqlite"
+    names = [f"t{i}" for i in range(30)]
+
+    def _store(name):
+        layout = "blob" if name.endswith("0") else "columns"
+        store_matrices_in_database(db_path, matrix, name, layout=layout)
+        return retrieve_matrix_from_database(db_path, name)
+
+    with ThreadPoolExecutor(max_workers=6) as executor:
+        results = list(executor.map(_store, names))
+
+    for result in results:
+        np.testing.assert_allclose(result.to_numpy(), matrix.to_numpy(), rtol=1e-6)
+    assert set(list_matrix_tables(db_path)["table_name"]) == set(names)
+
+
+def test_concurrent_long_feature_lists(tmp_path):
+    # Lists over _MAX_INLINE_FEATURES go through the temp feature table
+    db_path = tmp_path / "matrices.sqlite"
+    rng = np.random.default_rng(1)
+    n_features = 2 * extract_sql._MAX_INLINE_FEATURES
+    matrix = pd.DataFrame(
+        rng.random((n_features, 3)),
+        index=[f"Gene_{i}" for i in range(n_features)],
+        columns=["a", "b", "c"],
+    )
+    store_matrices_in_database(db_path, matrix, "expr")
+    store_matrices_in_database(db_path, matrix, "meth", layout="blob")
+    features = matrix.index[: extract_sql._MAX_INLINE_FEATURES + 100].tolist()
+    expected = matrix.loc[sorted(features)]
+
+    def _retrieve(i):
+        return retrieve_matrix_from_database(
+            db_path, "expr" if i % 2 else "meth", features=features
+        )
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(_retrieve, range(200)))
+
+    for result in results:
+        assert result.index.tolist() == expected.index.tolist()
+        np.testing.assert_allclose(result.to_numpy(), expected.to_numpy(), rtol=1e-6)
+
+
+@pytest.mark.parametrize("layout", ["columns", "blob"])
+def test_parallel_retrieval_matches_serial(tmp_path, matrix, layout):
+    db_path = tmp_path / "matrices.sqlite"
+    store_matrices_in_database(db_path, matrix, "expr", layout=layout)
+    features = [f"Gene_{i}" for i in (40, 2, 17, 9, 33, 21)]
+
+    serial = retrieve_matrix_from_database(db_path, "expr", features=features)
+    parallel = retrieve_matrix_from_database(db_path, "expr", features=features, n_threads=4)
+
+    assert serial.index.is_monotonic_increasing
+    pd.testing.assert_frame_equal(parallel, serial)
+
+
+@pytest.mark.parametrize(
+    "index", [["b", "c", "a", "e", "d"], [30, 4, 17, 2, 9]], ids=["strings", "integers"]
+)
+def test_columns_layout_keeps_stored_order(tmp_path, index):
+    db_path = tmp_path / "matrices.sqlite"
+    matrix = pd.DataFrame(
+        np.arange(10, dtype=float).reshape(5, 2), index=index, columns=["s1", "s2"]
+    )
+    store_matrices_in_database(db_path, matrix, "expr")
+
+    result = retrieve_matrix_from_database(db_path, "expr")
+
+    assert result.index.tolist() == index
+    assert result.columns.tolist() == ["s1", "s2"]
+    pd.testing.assert_frame_equal(result, matrix, check_names=False, check_index_type=False)
+
+
+def test_columns_layout_has_only_feature_and_sample_columns(tmp_path, matrix):
+    db_path = tmp_path / "matrices.sqlite"
+    store_matrices_in_database(db_path, matrix, "gCSI_mRNA")
+
+    conn = sqlite3.connect(db_path)
+    try:
+        columns = [row[1] for row in conn.execute('PRAGMA table_info("gCSI_mRNA")')]
+        tables = list_droma_database_tables(connection=conn).set_index("table_name")
+    finally:
+        conn.close()
+
+    assert columns == ["feature_id"] + matrix.columns.tolist()
+    assert tables.loc["gCSI_mRNA", "sample_count"] == 4
+
+
+def test_retrieve_real_columns_holding_text(tmp_path, matrix):
+    db_path = tmp_path / "matrices.sqlite"
+    store_matrices_in_database(db_path, matrix, "expr")
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("""UPDATE expr SET "Sample_1" = 'n/a' WHERE feature_id = 'Gene_2'""")
+        conn.commit()
+    finally:
+        conn.close()
+
+    result = retrieve_matrix_from_database(db_path, "expr")
+
+    assert result.index.tolist() == matrix.index.tolist()
+    assert result.loc["Gene_2", "Sample_1"] == "n/a"
+    assert result.loc["Gene_3", "Sample_1"] == pytest.approx(matrix.loc["Gene_3", "Sample_1"])
@@ -0,0 +1,73 @@
+"""Tests for name harmonization in droma_py.harmonization."""
+
+import sqlite3
+
+import pandas as pd
+import pytest
+
+from droma_py.harmonization import check_droma_sample_names
+from droma_py.management import _SAMPLE_ANNO_COLUMNS, update_droma_database
+
+
+@pytest.fixture
+def connection(tmp_path):
+    conn = sqlite3.connect(tmp_path / "droma.sqlite")
+    columns = ", ".join(f'"{column}" TEXT' for column in _SAMPLE_ANNO_COLUMNS)
+    conn.execute(f"CREATE TABLE sample_anno ({columns})")
+    conn.executemany(
+        "INSERT INTO sample_anno (SampleID, ProjectID) VALUES (?, 'P')",
+        [("MCF7",), ("HeLa",)],
+    )
+    conn.commit()
+    yield conn
+    conn.close()
+
+
+def _harmonized(connection, name):
+    return check_droma_sample_names([name], connection=connection)["harmonized_name"].iloc[0]
+
+
+def test_cache_sees_delete_and_insert_on_same_connection(connection):
+    assert _harmonized(connection, "HeLa") == "HeLa"
+
+    # Same row count and largest rowid as before
+    connection.execute("DELETE FROM sample_anno WHERE SampleID = 'HeLa'")
+    connection.execute("INSERT INTO sample_anno (SampleID, ProjectID) VALUES ('A549', 'P')")
+    connection.commit()
+
+    assert _harmonized(connection, "HeLa") != "HeLa"
+    assert _harmonized(connection, "A549") == "A549"
+
+
+def test_cache_sees_update_on_same_connection(connection):
+    assert _harmonized(connection, "HeLa") == "HeLa"
+
+    connection.execute("UPDATE sample_anno SET SampleID = 'A549' WHERE SampleID = 'HeLa'")
+
+    assert _harmonized(connection, "A549") == "A549"
+
+
+def test_cache_sees_overwritten_table(connection):
+    assert _harmonized(connection, "HeLa") == "HeLa"
+
+    replacement = pd.DataFrame(
+        {"SampleID": ["MCF7", "A549"], "ProjectID": "P", "ProjectRawName": None, "AlternateName": None}
+    )
+    update_droma_database(replacement, "sample_anno", overwrite=True, connection=connection)
+
+    assert _harmonized(connection, "HeLa") != "HeLa"
+    assert _harmonized(connection, "A549") == "A549"
+
+
+def test_cache_sees_commits_from_other_connections(connection, tmp_path):
+    assert _harmonized(connection, "HeLa") == "HeLa"
+
+    other = sqlite3.connect(tmp_path / "droma.sqlite")
+    try:
+        other.execute("DELETE FROM sample_anno WHERE SampleID = 'HeLa'")
+        other.execute("INSERT INTO sample_anno (SampleID, ProjectID) VALUES ('A549', 'P')")
+        other.commit()
+    finally:
+        other.close()
+
+    assert _harmonized(connection, "A549") == "A549"
@@ -0,0 +1,65 @@
+"""Tests for database management in droma_py.management."""
+
+import sqlite3
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from droma_py.extract_sql import list_matrix_tables, store_matrices_in_database
+from droma_py.management import list_droma_database_tables, update_droma_database
+
+
+@pytest.fixture
+def matrix() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        rng.random((20, 3)),
+        index=[f"Gene_{i}" for i in range(20)],
+        columns=[f"Sample_{i}" for i in range(3)],
+    )
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "droma.sqlite"
+
+
+def test_list_tables_excludes_matrix_metadata(db_path, matrix):
+    store_matrices_in_database(db_path, matrix, "gCSI_mRNA")
+
+    conn = sqlite3.connect(db_path)
+    try:
+        tables = list_droma_database_tables(connection=conn)
+    finally:
+        conn.close()
+
+    assert tables["table_name"].tolist() == ["gCSI_mRNA"]
+
+
+def test_update_replaces_recorded_matrix_dimensions(db_path, matrix):
+    store_matrices_in_database(db_path, matrix, "gCSI_mRNA")
+
+    conn = sqlite3.connect(db_path)
+    try:
+        update_droma_database(matrix.iloc[:5, :2], "gCSI_mRNA", overwrite=True, connection=conn)
+    finally:
+        conn.close()
+
+    tables = list_matrix_tables(db_path).set_index("table_name")
+    assert tables.loc["gCSI_mRNA", "n_features"] == 5
+    assert tables.loc["gCSI_mRNA", "n_samples"] == 2
+
+
+def test_list_tables_hides_blob_side_tables(db_path, matrix):
+    store_matrices_in_database(db_path, matrix, "gCSI_mRNA", layout="blob", dtype="int8")
+
+    conn = sqlite3.connect(db_path)
+    try:
+        tables = list_droma_database_tables(connection=conn).set_index("table_name")
+    finally:
+        conn.close()
+
+    assert tables.index.tolist() == ["gCSI_mRNA"]
+    assert tables.loc["gCSI_mRNA", "feature_count"] == 20
+    assert tables.loc["gCSI_mRNA", "sample_count"] == 3